@@ -1,6 +1,12 @@
 import sys
 import os
 import io
+import re
+import queue
+import time
+import bisect
+import hashlib
+from collections import deque, OrderedDict
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -11,25 +17,40 @@ from PyQt5.QtWidgets import (
     QSplitter,
     QPlainTextEdit,
     QListWidget,
-    QTextEdit,
     QListWidgetItem,
+    QListView,
+    QTableWidget,
+    QTableWidgetItem,
     QFileDialog,
     QMenuBar,
 )
-from PyQt5.QtGui import QFont, QColor, QTextCharFormat, QSyntaxHighlighter, QPixmap, QIcon
-from PyQt5.QtCore import Qt, QRegularExpression, QSize
+from PyQt5.QtGui import QFont, QColor, QTextCharFormat, QSyntaxHighlighter, QPixmap, QIcon, QImage
+from PyQt5.QtCore import (
+    Qt, QRegularExpression, QSize, QTimer, QObject, pyqtSignal,
+    QAbstractListModel, QModelIndex, QRunnable, QThreadPool, QThread, QFileSystemWatcher,
+)
 import os
 import threading
 import traceback
 
 
-from helpersLib import KThread
-from mouseLib import recordMouseEvents, replayMouseEvents
+import metricsLib
+from helpersLib import KThread, AutosaveWorker
+from runnerLib import ScriptProcess, scriptNamespace
+from mouseLib import recordMouseEvents, replayMouseEvents, startReplay
 from screenLib import *
 
 
 class PythonHighlighter(QSyntaxHighlighter):
-    """Syntax highlighter for Python code."""
+    """Syntax highlighter for Python code.
+
+    Each block is tokenized in a single left-to-right pass of one combined expression, so a
+    keyword inside a string or comment is never coloured. Triple-quoted strings left open at the
+    end of a block are carried into the next one through the block state.
+    """
+
+    # Block states: not in a string, or inside a ''' or """ string at the end of the block
+    NORMAL, IN_SINGLE_TRIPLE, IN_DOUBLE_TRIPLE = -1, 1, 2
 
     def __init__(self, document):
         super().__init__(document)
@@ -39,33 +60,149 @@ class PythonHighlighter(QSyntaxHighlighter):
             "if", "import", "in", "is", "lambda", "None", "nonlocal", "not", "or",
             "pass", "raise", "return", "True", "try", "while", "with", "yield",
         ]
+        # The automation API injected into editor scripts
+        self.api_names = sorted(set(scriptNamespace()) | {"stop_thread_event"})
         self.initHighlightingRules()
 
     def initHighlightingRules(self):
         """Define syntax highlighting rules."""
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor("#ff4500"))
-        keyword_format.setFontWeight(QFont.Bold)
+        self.keyword_format = QTextCharFormat()
+        self.keyword_format.setForeground(QColor("#ff4500"))
+        self.keyword_format.setFontWeight(QFont.Bold)
+
+        self.api_format = QTextCharFormat()
+        self.api_format.setForeground(QColor("#1e6fd9"))
+
+        self.string_format = QTextCharFormat()
+        self.string_format.setForeground(QColor("#008000"))
+
+        self.comment_format = QTextCharFormat()
+        self.comment_format.setForeground(QColor("#808080"))
+
+        # Alternatives are tried in order at each position; triple quotes must come before plain strings
+        self.tokenizer = QRegularExpression(
+            r"(?<comment>#.*)"
+            r"|(?<triple>(?:\b[rRbBuUfF]{1,2})?(?:'''|\"\"\"))"
+            r"|(?<string>(?:\b[rRbBuUfF]{1,2})?(?:\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'))"
+            rf"|(?<keyword>\b(?:{'|'.join(self.keywords)})\b)"
+            rf"|(?<api>\b(?:{'|'.join(self.api_names)})\b)"
+        )
+        self.triple_ends = {
+            self.IN_SINGLE_TRIPLE: QRegularExpression(r"(?<!\\)'''"),
+            self.IN_DOUBLE_TRIPLE: QRegularExpression(r"(?<!\\)\"\"\""),
+        }
 
-        self.highlighting_rules = [
-            (QRegularExpression(rf"\b{kw}\b"), keyword_format) for kw in self.keywords
-        ]
+    def _closeTripleString(self, text, start, state):
+        """Colour a triple-quoted string from start; return where it ends, or -1 if it runs past the block."""
+        match = self.triple_ends[state].match(text, start)
+        if not match.hasMatch():
+            self.setFormat(start, len(text) - start, self.string_format)
+            self.setCurrentBlockState(state)
+            return -1
+        end = match.capturedEnd()
+        self.setFormat(start, end - start, self.string_format)
+        return end
 
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor("#008000"))
-        self.highlighting_rules.append((QRegularExpression(r'".*?"|\'.*?\''), string_format))
+    def highlightBlock(self, text):
+        self.setCurrentBlockState(self.NORMAL)
+        position = 0
+
+        # Finish a triple-quoted string left open by the previous block
+        if self.previousBlockState() in self.triple_ends:
+            position = self._closeTripleString(text, 0, self.previousBlockState())
+            if position < 0:
+                return
+
+        while position < len(text):
+            match = self.tokenizer.match(text, position)
+            if not match.hasMatch():
+                break
+            start, end = match.capturedStart(), match.capturedEnd()
+
+            if match.capturedStart("triple") >= 0:
+                self.setFormat(start, end - start, self.string_format)
+                state = self.IN_DOUBLE_TRIPLE if match.captured("triple").endswith('"') else self.IN_SINGLE_TRIPLE
+                end = self._closeTripleString(text, end, state)
+                if end < 0:
+                    return
+            elif match.capturedStart("comment") >= 0:
+                self.setFormat(start, end - start, self.comment_format)
+            elif match.capturedStart("string") >= 0:
+                self.setFormat(start, end - start, self.string_format)
+            elif match.capturedStart("keyword") >= 0:
+                self.setFormat(start, end - start, self.keyword_format)
+            else:
+                self.setFormat(start, end - start, self.api_format)
 
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor("#808080"))
-        self.highlighting_rules.append((QRegularExpression(r"#.*"), comment_format))
+            position = max(end, start + 1)
 
-    def highlightBlock(self, text):
-        for pattern, fmt in self.highlighting_rules:
-            match_iter = pattern.globalMatch(text)
-            while match_iter.hasNext():
-                match = match_iter.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
 
+# Completion: wait this long (ms) after the last keystroke before asking jedi, and keep this many latency samples
+COMPLETION_DEBOUNCE_INTERVAL = 150
+COMPLETION_LATENCY_SAMPLES = 200
+
+class CompletionWorker(QObject):
+    """Run jedi completions on a background thread.
+
+    Only the newest request is kept: a request that arrives while another is pending replaces
+    it, and results for requests that have been superseded are dropped instead of delivered.
+    """
+
+    completionsReady = pyqtSignal(int, list, float)  # Request id, suggestions, latency in seconds
+
+    def __init__(self, namespace):
+        super().__init__()
+        self.namespace = namespace
+        self._pending = None
+        self._latest_id = 0
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="CompletionWorker")
+        self._thread.start()
+
+    def request(self, request_id, source, line, column):
+        """Queue a completion request, replacing any request not yet started."""
+        with self._condition:
+            self._latest_id = request_id
+            self._pending = (request_id, source, line, column, time.perf_counter())
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _run(self):
+        try:
+            import jedi
+            project = jedi.Project(os.getcwd())
+            # Warm jedi's caches with the modules and API scripts use, before the first keystroke
+            jedi.preload_module("screenLib", "mouseLib", "featureLib", "ocrLib")
+            jedi.Interpreter("detectImage", [self.namespace], project=project).complete()
+        except Exception as e:
+            print(f"Autocomplete error: {e}")
+            return
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._stopped)
+                if self._stopped:
+                    return
+                request_id, source, line, column, requested_at = self._pending
+                self._pending = None
+
+            try:
+                # The interpreter namespace makes the injected automation API completable
+                completions = jedi.Interpreter(source, [self.namespace], project=project).complete(line=line, column=column)
+                suggestions = [c.name for c in completions]
+            except Exception as e:
+                print(f"Autocomplete error: {e}")
+                suggestions = []
+
+            with self._condition:
+                if request_id != self._latest_id:
+                    continue  # A newer request supersedes this one
+            self.completionsReady.emit(request_id, suggestions, time.perf_counter() - requested_at)
 
 class AutoCompleteEditor(QPlainTextEdit):
     """Python editor with auto-completion popup."""
@@ -83,19 +220,32 @@ class AutoCompleteEditor(QPlainTextEdit):
 
         self.highlighter = PythonHighlighter(self.document())
 
+        # Completions are computed off the GUI thread once typing pauses
+        self.completion_request_id = 0
+        self.completion_latencies = deque(maxlen=COMPLETION_LATENCY_SAMPLES)
+        self.completion_worker = CompletionWorker(scriptNamespace(stop_thread_event=threading.Event()))
+        self.completion_worker.completionsReady.connect(self.onCompletionsReady)
+        self.completion_timer = QTimer(self)
+        self.completion_timer.setSingleShot(True)
+        self.completion_timer.setInterval(COMPLETION_DEBOUNCE_INTERVAL)
+        self.completion_timer.timeout.connect(self.showCompletions)
+
     def keyPressEvent(self, event):
         super().keyPressEvent(event)
 
         # Check for autocompletion trigger
         if event.text().strip():
-            self.showCompletions()
+            self.completion_timer.start()
 
     def showCompletions(self):
-        """Show autocomplete suggestions."""
+        """Request autocomplete suggestions for the word under the cursor."""
         cursor = self.textCursor()
         cursor.select(cursor.WordUnderCursor)
         current_word = cursor.selectedText()
 
+        # Any answer still in flight is now stale
+        self.completion_request_id += 1
+
         if not current_word:
             self.popup.hide()
             return
@@ -104,22 +254,39 @@ class AutoCompleteEditor(QPlainTextEdit):
         script_source = self.toPlainText()
         line = cursor.blockNumber() + 1
         column = cursor.columnNumber()
+        self.completion_worker.request(self.completion_request_id, script_source, line, column)
 
-        try:
-            import jedi
-            script = jedi.Script(script_source)
-            completions = script.complete(line=line, column=column)
-            suggestions = [c.name for c in completions]
-
-            if suggestions:
-                self.showPopup(suggestions, cursor)
-            else:
-                self.popup.hide()
+    def onCompletionsReady(self, request_id, suggestions, latency):
+        """Show suggestions delivered by the completion worker, unless the editor has moved on."""
+        self.completion_latencies.append(latency)
+        if request_id != self.completion_request_id:
+            return
 
-        except Exception as e:
-            print(f"Autocomplete error: {e}")
+        if suggestions:
+            cursor = self.textCursor()
+            cursor.select(cursor.WordUnderCursor)
+            self.showPopup(suggestions, cursor)
+        else:
             self.popup.hide()
 
+    def completionStats(self):
+        """
+        Get completion latency metrics, measured from request to delivery.
+
+        Returns:
+            dict: The number of samples and the mean, median, 95th percentile and maximum latency in milliseconds.
+        """
+        samples = sorted(self.completion_latencies)
+        if not samples:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": len(samples),
+            "mean_ms": sum(samples) / len(samples) * 1000,
+            "p50_ms": samples[len(samples) // 2] * 1000,
+            "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
+
     def showPopup(self, suggestions, cursor):
         """Display the autocomplete popup."""
         self.popup.clear()
@@ -141,22 +308,285 @@ class AutoCompleteEditor(QPlainTextEdit):
         cursor.insertText(item.text())
         self.popup.hide()
 
+# Output console: lines kept in the widget, lines appended per refresh, and refresh period (ms)
+OUTPUT_MAX_LINES = 5000
+OUTPUT_BATCH_LINES = 20000
+OUTPUT_REFRESH_INTERVAL = 50
+
+# Autosave waits this long (ms) after the last edit before saving
+AUTOSAVE_DEBOUNCE_INTERVAL = 1000
+
 class OutputStream(io.StringIO):
-    """Custom output stream to redirect stdout/stderr."""
+    """Custom output stream to redirect stdout/stderr.
+
+    write() may be called from any thread and only queues the text; the GUI thread appends
+    queued lines to the editor in batches through drain().
+    """
 
     def __init__(self, editor):
         super().__init__()
         self.editor = editor
+        self.log_file = None
+        self._queue = queue.SimpleQueue()
 
     def write(self, text):
-        # Strip unnecessary trailing newlines and append text
+        # Strip unnecessary trailing newlines and queue text
         if text.strip():  # Avoid excessive empty lines
-            self.editor.append(text.rstrip())
-            self.editor.ensureCursorVisible()
+            self._queue.put(text.rstrip())
+        return len(text)
 
     def flush(self):
         pass  # Required for compatibility
 
+    def setLogFile(self, path):
+        """Also append every line to the given file, or stop logging if path is None."""
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        if path:
+            self.log_file = open(path, "a", encoding="utf-8")
+
+    def drain(self):
+        """Append queued lines to the editor. Must be called from the GUI thread."""
+        lines = []
+        try:
+            while len(lines) < OUTPUT_BATCH_LINES:
+                lines.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not lines:
+            return
+
+        if self.log_file is not None:
+            self.log_file.write("\n".join(lines) + "\n")
+            self.log_file.flush()
+
+        # Lines beyond the block limit would be dropped straight away, so skip them
+        self.editor.appendPlainText("\n".join(lines[-OUTPUT_MAX_LINES:]))
+        scroll_bar = self.editor.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+
+# Metrics panel: refresh period (ms) and the timing columns it shows
+METRICS_REFRESH_INTERVAL = 1000
+METRICS_COLUMNS = ["count", "mean_ms", "p90_ms", "max_ms"]
+
+# Thumbnails: edge length in pixels, cache folder inside the capture folder, and how many decoded icons stay in memory
+THUMBNAIL_SIZE = 100
+THUMBNAIL_CACHE_FOLDER = ".thumbnails"
+THUMBNAIL_ICON_CACHE_SIZE = 500
+THUMBNAIL_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+def _naturalKey(file_name):
+    """
+    Sort key that puts captured_region_9.png before captured_region_10.png.
+
+    The name itself breaks ties, so names like img1.png and img01.png, or A.png and a.png, never share a key.
+    """
+    return ([int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", file_name)], file_name)
+
+def thumbnailCachePath(cache_folder, file_path, stamp):
+    """Return where the thumbnail of a file with the given (mtime_ns, size) stamp is cached."""
+    key = hashlib.sha1(f"{os.path.abspath(file_path)}|{stamp[0]}|{stamp[1]}|{THUMBNAIL_SIZE}".encode()).hexdigest()
+    return os.path.join(cache_folder, f"{key}.png")
+
+def loadThumbnail(file_path, stamp, cache_folder):
+    """
+    Load the thumbnail of an image from the disk cache, or decode, scale and cache it.
+
+    Safe to call from worker threads: only QImage is used, never QPixmap.
+
+    Returns:
+        QImage: The thumbnail, or a null image if the file could not be read.
+    """
+    cache_path = thumbnailCachePath(cache_folder, file_path, stamp)
+    image = QImage(cache_path)
+    if not image.isNull():
+        return image
+
+    image = QImage(file_path)
+    if image.isNull():
+        return image
+    image = image.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    try:
+        os.makedirs(cache_folder, exist_ok=True)
+        temp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        if image.save(temp_path, "PNG"):
+            os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Could not cache the thumbnail of {file_path}: {e}")
+    return image
+
+def pruneThumbnailCache(cache_folder, keep_paths):
+    """Delete cached thumbnails that no longer belong to any image."""
+    keep = {os.path.basename(path) for path in keep_paths}
+    try:
+        for file_name in os.listdir(cache_folder):
+            if file_name not in keep:
+                os.remove(os.path.join(cache_folder, file_name))
+    except OSError:
+        pass
+
+class ThumbnailSignals(QObject):
+    """Carries results from thumbnail loaders back to the GUI thread."""
+
+    loaded = pyqtSignal(str, object, QImage)  # File name, (mtime_ns, size) stamp, thumbnail
+
+class ThumbnailLoader(QRunnable):
+    """Load one thumbnail on a QThreadPool worker."""
+
+    def __init__(self, signals, folder, file_name, stamp, cache_folder):
+        super().__init__()
+        self.signals = signals
+        self.file_path = os.path.join(folder, file_name)
+        self.file_name = file_name
+        self.stamp = stamp
+        self.cache_folder = cache_folder
+
+    def run(self):
+        image = loadThumbnail(self.file_path, self.stamp, self.cache_folder)
+        self.signals.loaded.emit(self.file_name, self.stamp, image)
+
+class ThumbnailModel(QAbstractListModel):
+    """List model over the images in a folder, with thumbnails loaded lazily in the background.
+
+    Icons are only requested when the view asks for a row's decoration, i.e. when it becomes
+    visible, and at most THUMBNAIL_ICON_CACHE_SIZE of them are kept in memory. A filesystem
+    watcher keeps the rows in line with the folder, inserting and removing only what changed.
+    """
+
+    def __init__(self, folder, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.cache_folder = os.path.join(folder, THUMBNAIL_CACHE_FOLDER)
+        self.files = []  # File names in natural order
+        self._keys = []  # Their sort keys, kept in step for bisect
+        self.stamps = {}  # File name -> (mtime_ns, size)
+        self.icons = OrderedDict()  # File name -> QIcon, least recently used first
+        self._pending = set()
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount() - 1)))
+        self.signals = ThumbnailSignals()
+        self.signals.loaded.connect(self.onThumbnailLoaded)
+
+        self.watcher = QFileSystemWatcher([folder], self)
+        self.watcher.directoryChanged.connect(self.refresh)
+        self.refresh()
+
+        # Cached thumbnails of deleted or re-captured images are cleaned up once per start
+        keep_paths = [thumbnailCachePath(self.cache_folder, os.path.join(folder, name), stamp)
+                      for name, stamp in self.stamps.items()]
+        threading.Thread(target=pruneThumbnailCache, args=(self.cache_folder, keep_paths), daemon=True).start()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.files)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.files):
+            return None
+        file_name = self.files[index.row()]
+        if role == Qt.DisplayRole:
+            return file_name
+        if role == Qt.ToolTipRole:
+            return os.path.join(self.folder, file_name)
+        if role == Qt.DecorationRole:
+            icon = self.icons.get(file_name)
+            if icon is None:
+                self._requestThumbnail(file_name)
+                return None
+            self.icons.move_to_end(file_name)
+            return icon
+        return None
+
+    def filePath(self, index):
+        """Return the full path of the image at a model index."""
+        return os.path.join(self.folder, self.files[index.row()])
+
+    def _requestThumbnail(self, file_name):
+        stamp = self.stamps.get(file_name)
+        if stamp is None or (file_name, stamp) in self._pending:
+            return
+        self._pending.add((file_name, stamp))
+        self.pool.start(ThumbnailLoader(self.signals, self.folder, file_name, stamp, self.cache_folder))
+
+    def onThumbnailLoaded(self, file_name, stamp, image):
+        self._pending.discard((file_name, stamp))
+        if self.stamps.get(file_name) != stamp:
+            return  # Removed or re-captured while loading
+        # Unreadable images get an empty icon so they aren't requested again
+        self.icons[file_name] = QIcon(QPixmap.fromImage(image)) if not image.isNull() else QIcon()
+        while len(self.icons) > THUMBNAIL_ICON_CACHE_SIZE:
+            self.icons.popitem(last=False)
+        self._rowChanged(file_name)
+
+    def _row(self, file_name):
+        """Return the row of a file, or -1 if it isn't listed."""
+        row = bisect.bisect_left(self._keys, _naturalKey(file_name))
+        if row < len(self.files) and self.files[row] == file_name:
+            return row
+        return -1
+
+    def _rowChanged(self, file_name):
+        row = self._row(file_name)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def _scanFolder(self):
+        stamps = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(THUMBNAIL_EXTENSIONS):
+                        stat = entry.stat()
+                        stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return stamps
+
+    def refresh(self, *args):
+        """Bring the rows in line with the folder, touching only files that were added, removed or changed."""
+        stamps = self._scanFolder()
+
+        if not self.files:
+            # First fill: one reset is far cheaper than thousands of row insertions
+            self.beginResetModel()
+            self.files = sorted(stamps, key=_naturalKey)
+            self._keys = [_naturalKey(name) for name in self.files]
+            self.stamps = stamps
+            self.endResetModel()
+            return
+
+        for file_name in [name for name in self.files if name not in stamps]:
+            row = self._row(file_name)
+            if row < 0:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.files[row]
+            del self._keys[row]
+            self.endRemoveRows()
+            del self.stamps[file_name]
+            self.icons.pop(file_name, None)
+
+        for file_name, stamp in stamps.items():
+            if file_name not in self.stamps:
+                key = _naturalKey(file_name)
+                row = bisect.bisect_left(self._keys, key)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.files.insert(row, file_name)
+                self._keys.insert(row, key)
+                self.stamps[file_name] = stamp
+                self.endInsertRows()
+            elif self.stamps[file_name] != stamp:
+                self.stamps[file_name] = stamp
+                self.icons.pop(file_name, None)
+                self._rowChanged(file_name)
+
+    def stop(self):
+        """Drop queued thumbnail loads and wait for running ones."""
+        self.pool.clear()
+        self.pool.waitForDone()
+
 class MainWindow(QMainWindow):
     """Main application window."""
 
@@ -165,13 +595,25 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Automaton")
         self.setGeometry(100, 100, 1200, 800)
 
-        # Autosave file
+        # Autosave file, written on a background thread once edits settle
         self.latest_script_path = os.path.join(os.getcwd(), "latest_script.py")
+        self.autosave_worker = AutosaveWorker(self.latest_script_path)
+        self.autosave_worker.start()
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DEBOUNCE_INTERVAL)
+        self.autosave_timer.timeout.connect(self.autosaveScript)
 
         # Initialize threading attributes
         self.script_thread = None
         self.stop_thread_event = threading.Event()
 
+        # Background mouse replay started from the Playback button
+        self.playback_job = None
+        self.playback_timer = QTimer(self)
+        self.playback_timer.setInterval(200)
+        self.playback_timer.timeout.connect(self.updatePlaybackProgress)
+
         # Capture folder
         self.capture_folder = os.path.join(os.getcwd(), "captures")
         os.makedirs(self.capture_folder, exist_ok=True)
@@ -195,37 +637,58 @@ class MainWindow(QMainWindow):
         # Script Editor
         self.editor = AutoCompleteEditor()
         editor_splitter.addWidget(self.editor)
-        self.editor.textChanged.connect(self.autosaveScript)
+        self.editor.textChanged.connect(self.autosave_timer.start)  # Restarting the timer coalesces edits
 
-        # Help Section
+        # Help Section, with the metrics panel below it
+        side_splitter = QSplitter(Qt.Vertical)
         self.help_list = QListWidget()
-        editor_splitter.addWidget(self.help_list)
+        side_splitter.addWidget(self.help_list)
+
+        self.metrics_table = QTableWidget(0, len(METRICS_COLUMNS) + 1)
+        self.metrics_table.setHorizontalHeaderLabels(["metric"] + METRICS_COLUMNS)
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        side_splitter.addWidget(self.metrics_table)
+        side_splitter.setStretchFactor(0, 2)
+        side_splitter.setStretchFactor(1, 1)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(METRICS_REFRESH_INTERVAL)
+        self.metrics_timer.timeout.connect(self.updateMetrics)
+        if metricsLib.isEnabled():
+            self.metrics_timer.start()
+
+        editor_splitter.addWidget(side_splitter)
         editor_splitter.setStretchFactor(0, 3)
         editor_splitter.setStretchFactor(1, 1)
 
         horizontal_splitter.addWidget(editor_splitter)
 
         # Thumbnails Section (Rightmost)
-        self.thumbnail_view = QListWidget()
-        self.thumbnail_view.setIconSize(QSize(100, 100))  # Thumbnail size
-        self.thumbnail_view.itemClicked.connect(self.insertImagePathToEditor)
+        # Only visible rows are laid out and have their thumbnails loaded
+        self.thumbnail_model = ThumbnailModel(self.capture_folder, self)
+        self.thumbnail_view = QListView()
+        self.thumbnail_view.setModel(self.thumbnail_model)
+        self.thumbnail_view.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))  # Thumbnail size
+        self.thumbnail_view.setUniformItemSizes(True)
+        self.thumbnail_view.setLayoutMode(QListView.Batched)
+        self.thumbnail_view.clicked.connect(self.insertImagePathToEditor)
         horizontal_splitter.addWidget(self.thumbnail_view)
         horizontal_splitter.setStretchFactor(0, 2)  # Editor + Help
         horizontal_splitter.setStretchFactor(1, 1)  # Thumbnails
 
-        self.updateThumbnails()
-
         # Vertical Splitter for Horizontal Content and Output Window
         vertical_splitter = QSplitter(Qt.Vertical)
         vertical_splitter.addWidget(horizontal_splitter)
 
         # Output Window
-        self.output_window = QTextEdit()
+        self.output_window = QPlainTextEdit()
         self.output_window.setFont(QFont("Courier", 10))
         self.output_window.setReadOnly(True)
+        self.output_window.setMaximumBlockCount(OUTPUT_MAX_LINES)  # Oldest lines are dropped first
 
         # Remove extra padding and set minimal margins
-        self.output_window.setStyleSheet("QTextEdit { padding: 2px; }")
+        self.output_window.setStyleSheet("QPlainTextEdit { padding: 2px; }")
         self.output_window.setContentsMargins(0, 0, 0, 0)
 
         vertical_splitter.addWidget(self.output_window)
@@ -244,31 +707,26 @@ class MainWindow(QMainWindow):
         self.populateHelp()
 
         # Redirect stdout/stderr to the output window
-        sys.stdout = OutputStream(self.output_window)
-        sys.stderr = OutputStream(self.output_window)
+        self.output_stream = OutputStream(self.output_window)
+        sys.stdout = self.output_stream
+        sys.stderr = self.output_stream
+        self.output_timer = QTimer(self)
+        self.output_timer.setInterval(OUTPUT_REFRESH_INTERVAL)
+        self.output_timer.timeout.connect(self.output_stream.drain)
+        self.output_timer.start()
 
         # Autoload the latest script
         self.autoloadScript()
 
-    def insertImagePathToEditor(self, item):
+    def insertImagePathToEditor(self, index):
         """Insert the clicked image's path into the editor."""
-        file_path = os.path.join(self.capture_folder, item.text())
+        file_path = self.thumbnail_model.filePath(index)
         cursor = self.editor.textCursor()
         cursor.insertText(f'"{file_path}"')
 
     def updateThumbnails(self):
-        """Populate the thumbnails view with images from the captures folder."""
-        self.thumbnail_view.clear()
-        for file_name in os.listdir(self.capture_folder):
-            if file_name.lower().endswith((".png", ".jpg", ".jpeg", ".bmp")):
-                file_path = os.path.join(self.capture_folder, file_name)
-                item = QListWidgetItem()
-                pixmap = QPixmap(file_path)
-                icon = QIcon(pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                item.setIcon(icon)
-                item.setText(file_name)
-                item.setToolTip(file_path)
-                self.thumbnail_view.addItem(item)
+        """Sync the thumbnails view with the captures folder; thumbnails load in the background."""
+        self.thumbnail_model.refresh()
 
     def createTopBar(self):
         top_bar_layout = QHBoxLayout()
@@ -285,9 +743,14 @@ class MainWindow(QMainWindow):
 
         # Playback button
         btn_playback = QPushButton("Playback")
-        btn_playback.clicked.connect(self.playback)
+        btn_playback.clicked.connect(self.togglePlayback)
         top_bar_layout.addWidget(btn_playback)
 
+        # Stop Playback button
+        btn_stop_playback = QPushButton("Stop Playback")
+        btn_stop_playback.clicked.connect(self.stopPlayback)
+        top_bar_layout.addWidget(btn_stop_playback)
+
         # Play Script button
         btn_play_script = QPushButton("Play Script")
         btn_play_script.clicked.connect(self.runScript)
@@ -302,7 +765,7 @@ class MainWindow(QMainWindow):
         return top_bar_layout
 
     def createMenuBar(self):
-        """Create the menu bar with File menu."""
+        """Create the menu bar with File and Run menus."""
         menu_bar = QMenuBar(self)
         self.setMenuBar(menu_bar)
 
@@ -317,14 +780,104 @@ class MainWindow(QMainWindow):
         load_action = file_menu.addAction("Load Script")
         load_action.triggered.connect(self.loadScript)
 
-    def autosaveScript(self):
-        """Automatically save the script in the editor to the latest script file."""
+        # Run Menu
+        run_menu = menu_bar.addMenu("Run")
+
+        # Run scripts in a child process: full speed and hard cancellation, but no GUI callbacks
+        self.run_in_process_action = run_menu.addAction("Run Scripts in Separate Process")
+        self.run_in_process_action.setCheckable(True)
+
+        # Copy everything printed to the output window into output.log as well
+        log_output_action = run_menu.addAction("Log Output to File")
+        log_output_action.setCheckable(True)
+        log_output_action.toggled.connect(self.toggleOutputLog)
+
+        # Time capture, matching and mouse stages into the metrics panel
+        run_menu.addSeparator()
+        metrics_action = run_menu.addAction("Collect Metrics")
+        metrics_action.setCheckable(True)
+        metrics_action.setChecked(metricsLib.isEnabled())
+        metrics_action.toggled.connect(self.toggleMetrics)
+
+        reset_metrics_action = run_menu.addAction("Reset Metrics")
+        reset_metrics_action.triggered.connect(self.resetMetrics)
+
+        export_metrics_action = run_menu.addAction("Export Metrics...")
+        export_metrics_action.triggered.connect(self.exportMetrics)
+
+    def toggleOutputLog(self, enabled):
+        """Start or stop copying the output window to output.log."""
+        log_path = os.path.join(os.getcwd(), "output.log")
         try:
-            with open(self.latest_script_path, "w") as file:
-                file.write(self.editor.toPlainText())
-            # print(f"Autosaved to {self.latest_script_path}")
+            self.output_stream.setLogFile(log_path if enabled else None)
+            if enabled:
+                print(f"Logging output to {log_path}")
         except Exception as e:
-            print(f"Error during autosave: {e}")
+            print(f"Error opening output log: {e}")
+
+    def toggleMetrics(self, enabled):
+        """Start or stop collecting metrics and refreshing the metrics panel."""
+        if enabled:
+            metricsLib.enable()
+            self.metrics_timer.start()
+        else:
+            metricsLib.disable()
+            self.metrics_timer.stop()
+        self.updateMetrics()
+
+    def resetMetrics(self):
+        metricsLib.reset()
+        self.updateMetrics()
+
+    def updateMetrics(self):
+        """Show the latest metrics snapshot in the metrics panel."""
+        snapshot = metricsLib.stats()
+        rows = [(name, [summary[column] for column in METRICS_COLUMNS]) for name, summary in snapshot["timings"].items()]
+        rows += [(name, [value] + [None] * (len(METRICS_COLUMNS) - 1)) for name, value in snapshot["counters"].items()]
+
+        self.metrics_table.setRowCount(len(rows))
+        for row, (name, values) in enumerate(rows):
+            self.metrics_table.setItem(row, 0, QTableWidgetItem(name))
+            for column, value in enumerate(values, start=1):
+                if value is None:
+                    text = ""
+                elif isinstance(value, float):
+                    text = f"{value:.2f}"
+                else:
+                    text = str(value)
+                self.metrics_table.setItem(row, column, QTableWidgetItem(text))
+        self.metrics_table.resizeColumnsToContents()
+
+    def exportMetrics(self):
+        """Save the current metrics as JSON or CSV."""
+        options = QFileDialog.Options()
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Metrics", "metrics.json", "JSON Files (*.json);;CSV Files (*.csv)", options=options
+        )
+        if file_path:
+            try:
+                if file_path.lower().endswith(".csv"):
+                    metricsLib.exportCsv(file_path)
+                else:
+                    metricsLib.exportJson(file_path)
+                print(f"Metrics exported to: {file_path}")
+            except Exception as e:
+                print(f"Error exporting metrics: {e}")
+
+    def autosaveScript(self):
+        """Automatically save the script in the editor to the latest script file."""
+        # Only the snapshot is taken here; hashing and the atomic write happen on the worker
+        self.autosave_worker.submit(self.editor.toPlainText())
+
+    def closeEvent(self, event):
+        """Flush a pending autosave and stop background workers before the window closes."""
+        if self.autosave_timer.isActive():
+            self.autosave_timer.stop()
+            self.autosaveScript()
+        self.autosave_worker.stop()
+        self.editor.completion_worker.stop()
+        self.thumbnail_model.stop()
+        super().closeEvent(event)
 
     def autoloadScript(self):
         """Automatically load the latest script into the editor on startup."""
@@ -369,11 +922,18 @@ class MainWindow(QMainWindow):
         functions = {
             "screenCapture": "Capture a region of the screen and save it.",
             "recordMouse": "Record mouse actions and save them.",
-            "playback": "Replay recorded mouse actions.",
+            "playback": "Replay recorded mouse actions (Playback button pauses/resumes).",
             "runScript": "Run the Python script written in the editor.",
             "detectImage": "Detect an image on the screen.",
             "clickOnImage": "Click on the specified part of the screen.",
             "waitForImage": "Wait for an image to appear on the screen.",
+            "detectImages": "Detect several images on one screenshot.",
+            "waitForAnyImage": "Wait for the first of several images to appear.",
+            "detectAllImages": "Find every instance of an image on the screen.",
+            "detectImageScaled": "Detect an image even if its scale changed.",
+            "watchForImage": "Wait for an image using the shared screen watcher.",
+            "findText": "Find text on the screen with OCR.",
+            "waitForText": "Wait for text to appear on the screen.",
         }
         for name, desc in functions.items():
             self.help_list.addItem(f"{name} - {desc}")
@@ -383,18 +943,7 @@ class MainWindow(QMainWindow):
         region = selectScreenRegion()
 
         if region:
-            # Check if file exists
-            output_path = "captures/captured_region.png"
-            if not os.path.exists("captures"):
-                os.makedirs("captures")
-            
-            # If file exists, rename it and increment the number
-            if os.path.exists(output_path):
-                i = 1
-                while os.path.exists(f"captures/captured_region_{i}.png"):
-                    i += 1
-                output_path = f"captures/captured_region_{i}.png"
-            
+            output_path = nextCapturePath("captures")
             captureScreenRegion(region, output_path)
             print(f"Region captured and saved to {output_path}")
             self.updateThumbnails()
@@ -406,41 +955,91 @@ class MainWindow(QMainWindow):
     def playback(self):
         replayMouseEvents("mouse_events.json")
 
+    def togglePlayback(self):
+        """Start replaying in the background, or pause/resume a replay that is already running."""
+        if self.playback_job is not None and self.playback_job.is_alive():
+            if self.playback_job.isPaused():
+                self.playback_job.resume()
+                print("Playback resumed.")
+            else:
+                self.playback_job.pause()
+                print("Playback paused.")
+            return
+
+        if not os.path.exists("mouse_events.json"):
+            print("No recording found. Record mouse events first.")
+            return
+        self.playback_job = startReplay("mouse_events.json")
+        self.playback_timer.start()
+        print("Playback started.")
+
+    def stopPlayback(self):
+        """Cancel the background replay, if any."""
+        if self.playback_job is not None and self.playback_job.is_alive():
+            self.playback_job.cancel()
+        else:
+            print("No playback is currently running.")
+
+    def updatePlaybackProgress(self):
+        """Show the background replay's progress in the status bar."""
+        job = self.playback_job
+        if job is None:
+            self.playback_timer.stop()
+            return
+        if job.is_alive():
+            state = "paused" if job.isPaused() else "playing"
+            if job.total:
+                self.statusBar().showMessage(f"Playback {state}: {job.completed}/{job.total} events ({job.progress():.0%})")
+            else:
+                self.statusBar().showMessage(f"Playback {state}: {job.completed} events")
+        else:
+            self.statusBar().showMessage(f"Playback finished: {job.completed} events", 3000)
+            self.playback_timer.stop()
+            self.playback_job = None
+
     def runScript(self):
         # Minimize the main window
         self.showMinimized()
-        """Run the script from the editor in a separate thread."""
+        """Run the script from the editor in a separate thread, or a separate process if enabled."""
         script = self.editor.toPlainText()
 
+        # Ensure only one script runs at a time
+        if self.script_thread is not None and self.script_thread.is_alive():
+            print("A script is already running.")
+            return
+
+        if self.run_in_process_action.isChecked():
+            self.script_thread = ScriptProcess(script)
+            self.script_thread.start()
+            print("Script execution started in a separate process.")
+            return
+
         def script_execution():
             # Reset the stop thread event
             self.stop_thread_event.clear()
             try:
-                exec(script, {
-                    'screenCapture': self.screenCapture,
-                    'recordMouse': self.recordMouse,
-                    'playback': self.playback,
-                    'detectImage': detectImage,
-                    'clickOnImage': clickOnImage,
-                    'waitForImage': waitForImage,
-                    'stop_thread_event': self.stop_thread_event,
-                })
+                exec(script, scriptNamespace(
+                    screenCapture=self.screenCapture,
+                    recordMouse=self.recordMouse,
+                    playback=self.playback,
+                    stop_thread_event=self.stop_thread_event,
+                ))
             except Exception:
                 traceback.print_exc(file=sys.stdout)
 
-        # Ensure only one script thread runs at a time
-        if self.script_thread is None or not self.script_thread.is_alive():
-            self.script_thread = KThread(target=script_execution, daemon=True)
-            self.script_thread.start()
-            print("Script execution started.")
-        else:
-            print("A script is already running.")
+        self.script_thread = KThread(target=script_execution, daemon=True)
+        self.script_thread.start()
+        print("Script execution started.")
 
     
     def stopScript(self):
         try:
             """Stop the currently running script."""
-            if self.script_thread and self.script_thread.is_alive():
+            if isinstance(self.script_thread, ScriptProcess) and self.script_thread.is_alive():
+                # Signals stop_thread_event, then terminates the process if it doesn't exit
+                self.script_thread.stop(timeout=1)
+                print("Script execution stopped.")
+            elif self.script_thread and self.script_thread.is_alive():
                 self.stop_thread_event.set()  # Signal the thread to stop
                 self.script_thread.join(timeout=1)
                 print("Script execution stopped.")
@@ -0,0 +1,250 @@
+"""
+Timing-fidelity benchmark for mouse replay and moveMouse.
+
+Replays synthetic recordings through an in-process stand-in for the pynput controllers, so it runs
+on a headless machine and never moves the real cursor. Results are written as JSON for tracking
+regressions between runs.
+
+Usage:
+    python benchmark.py --density 100 500 --duration 5 --output replay_benchmark.json
+"""
+import argparse
+import enum
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import types
+
+class FakeController:
+    """Stand-in for pynput's mouse Controller that logs every call with its perf_counter() time."""
+
+    def __init__(self):
+        self._position = (0, 0)
+        self.calls = []
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self.calls.append((time.perf_counter(), "move", value))
+        self._position = value
+
+    def press(self, button):
+        self.calls.append((time.perf_counter(), "press", button))
+
+    def release(self, button):
+        self.calls.append((time.perf_counter(), "release", button))
+
+    def click(self, button, count=1):
+        self.calls.append((time.perf_counter(), "click", button))
+
+    def scroll(self, dx, dy):
+        self.calls.append((time.perf_counter(), "scroll", (dx, dy)))
+
+class FakeKeyboardController:
+    """Stand-in for pynput's keyboard Controller that logs every call with its perf_counter() time."""
+
+    def __init__(self):
+        self.calls = []
+
+    def press(self, key):
+        self.calls.append((time.perf_counter(), "press", key))
+
+    def release(self, key):
+        self.calls.append((time.perf_counter(), "release", key))
+
+def _installFakePynput():
+    """Register a minimal pynput package so mouseLib imports without a display server."""
+    class Button(enum.Enum):
+        left = 1
+        right = 2
+        middle = 3
+
+    Key = enum.Enum("Key", ["alt", "ctrl", "ctrl_l", "ctrl_r", "shift", "enter", "esc", "tab", "space", "f1"])
+
+    class KeyCode:
+        def __init__(self, char=None, vk=None):
+            self.char, self.vk = char, vk
+
+        @classmethod
+        def from_char(cls, char):
+            return cls(char=char)
+
+        @classmethod
+        def from_vk(cls, vk):
+            return cls(vk=vk)
+
+    class Listener:
+        def __init__(self, *args, **kwargs):
+            raise RuntimeError("Input listeners are not available in the benchmark")
+
+    pynput = types.ModuleType("pynput")
+    pynput.mouse = types.ModuleType("pynput.mouse")
+    pynput.mouse.Button, pynput.mouse.Controller, pynput.mouse.Listener = Button, FakeController, Listener
+    pynput.keyboard = types.ModuleType("pynput.keyboard")
+    pynput.keyboard.Key, pynput.keyboard.KeyCode = Key, KeyCode
+    pynput.keyboard.Controller, pynput.keyboard.Listener = FakeKeyboardController, Listener
+    sys.modules.update({"pynput": pynput, "pynput.mouse": pynput.mouse, "pynput.keyboard": pynput.keyboard})
+
+try:
+    import mouseLib
+except ImportError:
+    # pynput needs a display server; the benchmark only needs the stand-ins
+    _installFakePynput()
+    import mouseLib
+
+from recordingLib import openEventWriter
+
+def makeSyntheticRecording(path, events_per_second=100, duration=5.0, click_every=50):
+    """
+    Write a synthetic recording of steady mouse moves with periodic clicks.
+
+    Args:
+        path (str): The output path; its extension picks the format.
+        events_per_second (float): Event density. Default is 100.
+        duration (float): Length of the recording in seconds. Default is 5.0.
+        click_every (int): Insert a press/release pair every this many moves. Default is 50.
+
+    Returns:
+        list: The intended time offset of every event, in order.
+    """
+    count = max(1, int(events_per_second * duration))
+    events = []
+    for i in range(count):
+        t = i / events_per_second
+        x, y = 100 + (i * 7) % 1200, 100 + (i * 3) % 700
+        if click_every and i % click_every == click_every - 1:
+            # Alternate on the click count so every press is followed by its release
+            pressed = (i // click_every) % 2 == 0
+            events.append({"type": "click", "time": t, "x": x, "y": y, "button": "Button.left", "pressed": pressed})
+        else:
+            events.append({"type": "move", "time": t, "x": x, "y": y})
+
+    writer = openEventWriter(path)
+    if writer is not None:
+        with writer:
+            for event in events:
+                writer.append(event)
+    else:
+        with open(path, "w") as f:
+            json.dump(events, f)
+    return [event["time"] for event in events]
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+def _latenessSummary(lateness):
+    ordered = sorted(lateness)
+    return {
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p90_ms": _percentile(ordered, 0.90) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        "mean_ms": (sum(ordered) / len(ordered) if ordered else 0.0) * 1000,
+    }
+
+def benchmarkReplay(path, intended_times, speed=1.0):
+    """
+    Replay a recording through the fake controllers and measure how closely events hit their deadlines.
+
+    Returns:
+        dict: Lateness percentiles, total drift, event rate and CPU time.
+    """
+    controller, keyboard_controller = FakeController(), FakeKeyboardController()
+    # Only recorded events are timed, so no interpolated moves may be interleaved with them
+    job = mouseLib.ReplayJob(path, speed=speed, controller=controller, keyboard_controller=keyboard_controller,
+                             interpolate=False)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    job.run()
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    delivered = sorted(controller.calls + keyboard_controller.calls, key=lambda call: call[0])
+    lateness = [call[0] - (start + target / speed) for call, target in zip(delivered, intended_times)]
+    return {
+        "events": len(delivered),
+        "lateness": _latenessSummary(lateness),
+        "drift_ms": (lateness[-1] if lateness else 0.0) * 1000,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_utilisation": cpu / wall if wall else 0.0,
+        "events_per_second": len(delivered) / wall if wall else 0.0,
+    }
+
+def benchmarkMoveMouse(duration=0.5, steps=50, moves=10):
+    """
+    Run moveMouse through the fake controller and measure how well it keeps to its duration.
+
+    Returns:
+        dict: Overrun percentiles against the requested duration, points delivered and CPU time.
+    """
+    controller = FakeController()
+    mouseLib.setController(controller)
+    overruns = []
+    points = []
+
+    cpu_start = time.process_time()
+    for i in range(moves):
+        calls_before = len(controller.calls)
+        start = time.perf_counter()
+        mouseLib.moveMouse(200 + 50 * i, 300 + 20 * i, duration=duration, steps=steps)
+        overruns.append(controller.calls[-1][0] - start - duration)
+        points.append(len(controller.calls) - calls_before)
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "moves": moves,
+        "duration_s": duration,
+        "steps": steps,
+        "overrun": _latenessSummary(overruns),
+        "mean_points_delivered": sum(points) / len(points),
+        "cpu_s": cpu,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure replay and moveMouse timing fidelity.")
+    parser.add_argument("--density", type=float, nargs="+", default=[100.0, 500.0], help="Events per second to test.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Length of each synthetic recording in seconds.")
+    parser.add_argument("--format", choices=["json", "jsonl", "mrec"], default="json", help="Recording format to replay.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier.")
+    parser.add_argument("--moves", type=int, default=10, help="Number of moveMouse calls to time.")
+    parser.add_argument("--output", default="replay_benchmark.json", help="Where to write the JSON results.")
+    args = parser.parse_args()
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "spin_threshold_s": mouseLib.SPIN_THRESHOLD,
+        "replay": [],
+    }
+
+    with tempfile.TemporaryDirectory() as folder:
+        for density in args.density:
+            path = os.path.join(folder, f"synthetic_{int(density)}.{args.format}")
+            intended_times = makeSyntheticRecording(path, density, args.duration)
+            result = benchmarkReplay(path, intended_times, args.speed)
+            result.update({"density": density, "duration_s": args.duration, "format": args.format, "speed": args.speed})
+            results["replay"].append(result)
+            print(f"Replay {density:g} ev/s: p50 {result['lateness']['p50_ms']:.3f} ms, "
+                  f"p99 {result['lateness']['p99_ms']:.3f} ms, CPU {result['cpu_utilisation']:.0%}")
+
+    results["moveMouse"] = benchmarkMoveMouse(moves=args.moves)
+    print(f"moveMouse: p50 overrun {results['moveMouse']['overrun']['p50_ms']:.3f} ms")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
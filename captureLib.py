@@ -0,0 +1,203 @@
+import os
+import threading
+import cv2
+import numpy as np
+import pyautogui
+import metricsLib
+
+class CaptureBackend:
+    """Base class for screen-capture backends.
+
+    Frames are returned as RGB arrays from grab() and as single-channel arrays from grabGray().
+    Regions use the (x, y, width, height) format used throughout screenLib.
+    """
+
+    name = None
+
+    def grab(self, region=None):
+        """Capture the screen, or a region of it, as an RGB array."""
+        raise NotImplementedError
+
+    def grabGray(self, region=None):
+        """Capture the screen, or a region of it, as a grayscale array."""
+        frame = self.grab(region)
+        with metricsLib.timed("capture.cvtColor"):
+            return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+    def size(self):
+        """Return the (width, height) of the captured screen."""
+        raise NotImplementedError
+
+class PyAutoGUIBackend(CaptureBackend):
+    """Capture through pyautogui.screenshot(), which goes through a PIL image."""
+
+    name = "pyautogui"
+
+    def grab(self, region=None):
+        with metricsLib.timed("capture.grab"):
+            return np.asarray(pyautogui.screenshot(region=region))
+
+    def grabGray(self, region=None):
+        with metricsLib.timed("capture.grab"):
+            screenshot = pyautogui.screenshot(region=region)
+        # Let PIL do the luma conversion so the RGB frame is never copied into numpy
+        with metricsLib.timed("capture.cvtColor"):
+            return np.asarray(screenshot.convert("L"))
+
+    def size(self):
+        return tuple(pyautogui.size())
+
+class MSSBackend(CaptureBackend):
+    """Capture straight into numpy through the optional mss package, skipping PIL."""
+
+    name = "mss"
+
+    def __init__(self, monitor=1):
+        import mss  # Optional dependency, only needed when this backend is selected
+        self._mss = mss
+        self.monitor = monitor
+        # mss handles are not thread-safe, so each thread gets its own
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._mss.mss()
+        return session
+
+    def _grabBGRA(self, region):
+        session = self._session()
+        if region is None:
+            area = session.monitors[self.monitor]
+        else:
+            origin = session.monitors[self.monitor]
+            area = {"left": origin["left"] + region[0], "top": origin["top"] + region[1],
+                    "width": region[2], "height": region[3]}
+        with metricsLib.timed("capture.grab"):
+            shot = session.grab(area)
+        # A view over the raw buffer; no copy is made until the colour conversion
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def grab(self, region=None):
+        frame = self._grabBGRA(region)
+        with metricsLib.timed("capture.cvtColor"):
+            return cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB)
+
+    def grabGray(self, region=None):
+        frame = self._grabBGRA(region)
+        with metricsLib.timed("capture.cvtColor"):
+            return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+
+    def size(self):
+        area = self._session().monitors[self.monitor]
+        return (area["width"], area["height"])
+
+class FileBackend(CaptureBackend):
+    """Serve frames from image files or arrays, for headless runs and tests.
+
+    Each grab returns the next frame in order; the last frame repeats once the list runs out
+    unless loop is True.
+    """
+
+    name = "file"
+
+    def __init__(self, frames=(), loop=False):
+        self.loop = loop
+        self._frames = []
+        self._index = 0
+        self._lock = threading.Lock()
+        for frame in frames:
+            self.addFrame(frame)
+
+    def addFrame(self, frame):
+        """Append a frame, given as an image path or an RGB/grayscale array."""
+        if isinstance(frame, str):
+            image = cv2.imread(frame, cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError(f"Could not load the frame {frame}")
+            frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        elif frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+        with self._lock:
+            self._frames.append(frame)
+
+    def setFrame(self, frame):
+        """Replace all frames with a single one."""
+        with self._lock:
+            self._frames = []
+            self._index = 0
+        self.addFrame(frame)
+
+    def _nextFrame(self):
+        with self._lock:
+            if not self._frames:
+                raise RuntimeError("The file capture backend has no frames")
+            frame = self._frames[self._index]
+            if self._index + 1 < len(self._frames):
+                self._index += 1
+            elif self.loop:
+                self._index = 0
+            return frame
+
+    def grab(self, region=None):
+        frame = self._nextFrame()
+        if region is not None:
+            x, y, width, height = region
+            frame = frame[y:y + height, x:x + width]
+        return frame.copy()
+
+    def size(self):
+        with self._lock:
+            if not self._frames:
+                return (0, 0)
+            height, width = self._frames[self._index].shape[:2]
+        return (width, height)
+
+CAPTURE_BACKENDS = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    MSSBackend.name: MSSBackend,
+    FileBackend.name: FileBackend,
+}
+
+_capture_backend = None
+_capture_backend_lock = threading.Lock()
+
+def setCaptureBackend(backend, **options):
+    """
+    Select the backend used for screen captures.
+
+    Args:
+        backend (str or CaptureBackend): A backend name ("pyautogui", "mss", "file") or a backend instance.
+        **options: Keyword arguments passed to the backend when it is given by name.
+
+    Returns:
+        CaptureBackend: The backend now in use.
+    """
+    global _capture_backend
+    if isinstance(backend, str):
+        if backend not in CAPTURE_BACKENDS:
+            raise ValueError(f"Unknown capture backend: {backend}")
+        backend = CAPTURE_BACKENDS[backend](**options)
+    with _capture_backend_lock:
+        _capture_backend = backend
+    return backend
+
+def getCaptureBackend():
+    """
+    Get the backend used for screen captures.
+
+    The first call picks the backend named by the AUTOMATON_CAPTURE_BACKEND environment variable,
+    falling back to pyautogui. For the file backend, AUTOMATON_CAPTURE_FILE names the frame to serve.
+
+    Returns:
+        CaptureBackend: The backend in use.
+    """
+    global _capture_backend
+    with _capture_backend_lock:
+        if _capture_backend is None:
+            name = os.environ.get("AUTOMATON_CAPTURE_BACKEND", PyAutoGUIBackend.name)
+            if name == FileBackend.name and os.environ.get("AUTOMATON_CAPTURE_FILE"):
+                _capture_backend = FileBackend([os.environ["AUTOMATON_CAPTURE_FILE"]])
+            else:
+                _capture_backend = CAPTURE_BACKENDS.get(name, PyAutoGUIBackend)()
+        return _capture_backend
@@ -0,0 +1,257 @@
+import os
+import json
+import threading
+import cv2
+import numpy as np
+from captureLib import getCaptureBackend
+
+# On-disk descriptor index kept next to the images it describes: keypoints and descriptors in an
+# .npz archive, and the shape, stamp and array offsets of every image in a JSON sidecar
+FEATURE_INDEX_FILE = ".feature_index.npz"
+FEATURE_INDEX_VERSION = 2
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+# ORB settings; the small patch size keeps keypoints on small button-sized captures
+TEMPLATE_FEATURES = 500
+SCREEN_FEATURES = 5000
+ORB_PATCH_SIZE = 15
+RATIO_TEST = 0.75
+MIN_MATCHES = 8
+
+def _createOrb(n_features):
+    return cv2.ORB_create(nfeatures=n_features, edgeThreshold=ORB_PATCH_SIZE, patchSize=ORB_PATCH_SIZE)
+
+def _describe(orb, image_gray):
+    """Return (points, descriptors) for a grayscale image; points is an (N, 2) float32 array."""
+    keypoints, descriptors = orb.detectAndCompute(image_gray, None)
+    if descriptors is None:
+        return np.empty((0, 2), np.float32), np.empty((0, 32), np.uint8)
+    points = np.array([keypoint.pt for keypoint in keypoints], dtype=np.float32)
+    return points, descriptors
+
+class FeatureIndex:
+    """ORB descriptors for every image in a folder, persisted to disk and refreshed incrementally.
+
+    Entries are keyed by file name and carry the file's mtime and size, so update() only
+    re-extracts descriptors for images that were added or re-captured.
+    """
+
+    def __init__(self, folder="captures", index_path=None):
+        self.folder = folder
+        self.index_path = index_path or os.path.join(folder, FEATURE_INDEX_FILE)
+        self.sidecar_path = os.path.splitext(self.index_path)[0] + ".json"
+        self.entries = {}
+        self._orb = _createOrb(TEMPLATE_FEATURES)
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load the index from disk, starting empty if it is missing, inconsistent or from another version."""
+        try:
+            with open(self.sidecar_path, "r") as f:
+                meta = json.load(f)
+            if meta.get("version") != FEATURE_INDEX_VERSION:
+                return
+            # Plain arrays only: the folder is user data, so nothing in it may deserialize into code
+            with np.load(self.index_path, allow_pickle=False) as arrays:
+                points, descriptors = arrays["points"], arrays["descriptors"]
+            if len(points) != meta["keypoints"] or len(descriptors) != meta["keypoints"]:
+                raise ValueError("the keypoint arrays don't match the sidecar")
+
+            entries = {}
+            for file_name, entry in meta["entries"].items():
+                start, end = entry["start"], entry["start"] + entry["count"]
+                entries[file_name] = {
+                    "shape": tuple(entry["shape"]),
+                    "points": points[start:end].astype(np.float32).reshape(-1, 2),
+                    "descriptors": descriptors[start:end].astype(np.uint8).reshape(-1, 32),
+                    "stamp": tuple(entry["stamp"]),
+                }
+            self.entries = entries
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Could not load the feature index, rebuilding it: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the index to disk, each file atomically."""
+        meta = {"version": FEATURE_INDEX_VERSION, "keypoints": 0, "entries": {}}
+        points, descriptors = [], []
+        for file_name, entry in self.entries.items():
+            count = len(entry["points"])
+            meta["entries"][file_name] = {
+                "shape": list(entry["shape"]),
+                "stamp": list(entry["stamp"]),
+                "start": meta["keypoints"],
+                "count": count,
+            }
+            meta["keypoints"] += count
+            points.append(entry["points"])
+            descriptors.append(entry["descriptors"])
+
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                points=np.concatenate(points) if points else np.empty((0, 2), np.float32),
+                descriptors=np.concatenate(descriptors) if descriptors else np.empty((0, 32), np.uint8),
+            )
+        os.replace(temp_path, self.index_path)
+
+        # The sidecar goes last, so a crash in between leaves a mismatch that load() detects
+        temp_path = self.sidecar_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self.sidecar_path)
+
+    def _describeFile(self, file_path):
+        image = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return None
+        points, descriptors = _describe(self._orb, image)
+        return {"shape": image.shape, "points": points, "descriptors": descriptors}
+
+    def update(self):
+        """
+        Bring the index in line with the folder, describing only new or changed images.
+
+        Returns:
+            tuple: The number of (updated, removed) entries.
+        """
+        if not os.path.isdir(self.folder):
+            return (0, 0)
+
+        updated = removed = 0
+        with self._lock:
+            seen = set()
+            for file_name in os.listdir(self.folder):
+                if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                seen.add(file_name)
+                stat = os.stat(os.path.join(self.folder, file_name))
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                entry = self.entries.get(file_name)
+                if entry is not None and entry["stamp"] == stamp:
+                    continue
+                described = self._describeFile(os.path.join(self.folder, file_name))
+                if described is None:
+                    continue
+                described["stamp"] = stamp
+                self.entries[file_name] = described
+                updated += 1
+
+            for file_name in set(self.entries) - seen:
+                del self.entries[file_name]
+                removed += 1
+
+            if updated or removed:
+                self.save()
+
+        return (updated, removed)
+
+    def lookup(self, image_path):
+        """Return the indexed entry for an image, describing it on the fly if it isn't indexed."""
+        image_path = os.path.abspath(image_path)
+        if os.path.dirname(image_path) == os.path.abspath(self.folder):
+            with self._lock:
+                entry = self.entries.get(os.path.basename(image_path))
+            if entry is not None:
+                return entry
+        with self._lock:
+            return self._describeFile(image_path)
+
+def _locateEntry(entry, screen_points, screen_descriptors, matcher, min_matches):
+    """Estimate where an indexed image sits on the screen and return its center, or None."""
+    if len(entry["descriptors"]) < 2 or len(screen_descriptors) < 2:
+        return None
+
+    pairs = matcher.knnMatch(entry["descriptors"], screen_descriptors, k=2)
+    good = [pair[0] for pair in pairs if len(pair) == 2 and pair[0].distance < RATIO_TEST * pair[1].distance]
+    if len(good) < min_matches:
+        return None
+
+    source = entry["points"][[match.queryIdx for match in good]]
+    target = screen_points[[match.trainIdx for match in good]]
+    # A similarity transform covers DPI scaling and zoom without overfitting a full homography
+    transform, inliers = cv2.estimateAffinePartial2D(source, target, method=cv2.RANSAC)
+    if transform is None or int(inliers.sum()) < min_matches:
+        return None
+
+    height, width = entry["shape"]
+    center = transform @ np.array([width / 2.0, height / 2.0, 1.0])
+    return (int(round(center[0])), int(round(center[1])))
+
+_feature_indexes = {}
+_feature_indexes_lock = threading.Lock()
+
+def getFeatureIndex(folder="captures"):
+    """
+    Get the shared feature index for a folder, loading it from disk on first use.
+
+    Args:
+        folder (str): The folder of captured images. Default is "captures".
+
+    Returns:
+        FeatureIndex: The index for the folder.
+    """
+    key = os.path.abspath(folder)
+    with _feature_indexes_lock:
+        if key not in _feature_indexes:
+            _feature_indexes[key] = FeatureIndex(folder)
+        return _feature_indexes[key]
+
+def detectImagesScaled(image_paths, min_matches=MIN_MATCHES, region=None, folder="captures"):
+    """
+    Detect several images on the screen by feature matching, tolerating changes in scale.
+
+    Args:
+        image_paths (list): The paths to the images to detect.
+        min_matches (int): The minimum number of consistent keypoint matches. Default is 8.
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+        folder (str): The folder whose feature index is used. Default is "captures".
+
+    Returns:
+        dict: The center (x, y) coordinates of each image, keyed by its path, or None for images that were not found.
+    """
+    results = {image_path: None for image_path in image_paths}
+    try:
+        index = getFeatureIndex(folder)
+        index.update()
+        screen_gray = getCaptureBackend().grabGray(region)
+        # One descriptor extraction of the screen serves every lookup
+        screen_points, screen_descriptors = _describe(_createOrb(SCREEN_FEATURES), screen_gray)
+        matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+        offset_x, offset_y = (region[0], region[1]) if region is not None else (0, 0)
+
+        for image_path in image_paths:
+            entry = index.lookup(image_path)
+            if entry is None:
+                print(f"Error: Could not load the image {image_path}. Please check the image path.")
+                continue
+            center = _locateEntry(entry, screen_points, screen_descriptors, matcher, min_matches)
+            if center is not None:
+                results[image_path] = (offset_x + center[0], offset_y + center[1])
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    return results
+
+def detectImageScaled(image_path, min_matches=MIN_MATCHES, region=None, folder="captures"):
+    """
+    Detect the given image on the screen by feature matching, tolerating changes in scale.
+
+    Args:
+        image_path (str): The path to the image to detect.
+        min_matches (int): The minimum number of consistent keypoint matches. Default is 8.
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+        folder (str): The folder whose feature index is used. Default is "captures".
+
+    Returns:
+        tuple: The center (x, y) coordinates of the detected image, or None if not found.
+    """
+    center_coordinates = detectImagesScaled([image_path], min_matches, region, folder)[image_path]
+    if center_coordinates is None:
+        print("Image not found on the screen.")
+    return center_coordinates
@@ -1,5 +1,7 @@
 import sys
+import os
 import trace
+import hashlib
 import threading
 
 class KThread(threading.Thread):
@@ -34,4 +36,83 @@ method."""
     return self.localtrace
 
   def kill(self):
-    self.killed = True
\ No newline at end of file
+    self.killed = True
+
+def atomicWrite(path, text):
+  """Write text to path through a temporary file and an atomic rename."""
+  temp_path = f"{path}.{os.getpid()}.tmp"
+  try:
+    with open(temp_path, "w") as file:
+      file.write(text)
+      file.flush()
+      os.fsync(file.fileno())
+    os.replace(temp_path, path)
+  finally:
+    if os.path.exists(temp_path):
+      os.remove(temp_path)
+
+class AutosaveWorker(threading.Thread):
+  """Save text snapshots to a file on a background thread.
+
+Only the newest pending snapshot is written, and a snapshot whose hash
+matches the last saved content is skipped."""
+  def __init__(self, path):
+    threading.Thread.__init__(self, daemon=True, name="AutosaveWorker")
+    self.path = path
+    self.writes = 0
+    self.skipped = 0
+    self._pending = None
+    self._busy = False
+    self._stopped = False
+    self._condition = threading.Condition()
+    self._last_hash = None
+    try:
+      with open(path, "r") as file:
+        self._last_hash = hashlib.sha1(file.read().encode("utf-8")).hexdigest()
+    except (OSError, UnicodeDecodeError):
+      pass
+
+  def submit(self, text):
+    """Queue a snapshot, replacing any snapshot not yet written."""
+    with self._condition:
+      self._pending = text
+      self._condition.notify_all()
+
+  def flush(self, timeout=None):
+    """Wait until every submitted snapshot has been handled."""
+    with self._condition:
+      return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+  def stop(self, timeout=5):
+    """Write the last pending snapshot and stop the thread."""
+    with self._condition:
+      self._stopped = True
+      self._condition.notify_all()
+    self.join(timeout)
+
+  def run(self):
+    while True:
+      with self._condition:
+        self._condition.wait_for(lambda: self._pending is not None or self._stopped)
+        if self._pending is None:
+          return
+        text, self._pending = self._pending, None
+        self._busy = True
+      try:
+        self._save(text)
+      finally:
+        with self._condition:
+          self._busy = False
+          self._condition.notify_all()
+
+  def _save(self, text):
+    text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    if text_hash == self._last_hash:
+      self.skipped += 1
+      return
+    try:
+      atomicWrite(self.path, text)
+      self._last_hash = text_hash
+      self.writes += 1
+    except Exception as e:
+      print(f"Error during autosave: {e}")
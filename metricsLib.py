@@ -0,0 +1,164 @@
+import os
+import csv
+import json
+import time
+import threading
+from collections import deque
+
+# Samples kept per timing for percentiles; count, total, min and max cover every sample
+METRICS_SAMPLES = 2048
+
+_enabled = os.environ.get("AUTOMATON_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_timings = {}
+_counters = {}
+
+class _Timing:
+    """Running summary of one timed stage."""
+
+    __slots__ = ("count", "total", "min", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.samples = deque(maxlen=METRICS_SAMPLES)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def percentile(fraction):
+            return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))] * 1000
+
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_ms": self.total / self.count * 1000,
+            "min_ms": self.min * 1000,
+            "p50_ms": percentile(0.50),
+            "p90_ms": percentile(0.90),
+            "p99_ms": percentile(0.99),
+            "max_ms": self.max * 1000,
+        }
+
+class _Timer:
+    """Context manager that records the time spent in its block."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    """Shared do-nothing context manager handed out while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def enable():
+    """Start collecting metrics."""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Stop collecting metrics. Collected values are kept until reset()."""
+    global _enabled
+    _enabled = False
+
+def isEnabled():
+    return _enabled
+
+def reset():
+    """Drop all collected timings and counters."""
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+def timed(name):
+    """
+    Time a block of code under the given name.
+
+    Usage:
+        with timed("screen.capture"):
+            frame = grab()
+
+    Returns:
+        A context manager; while metrics are disabled it is a shared no-op.
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+def record(name, seconds):
+    """Add a duration, in seconds, to the named timing."""
+    if not _enabled:
+        return
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = _Timing()
+        timing.add(seconds)
+
+def count(name, amount=1):
+    """Add to the named counter."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def stats():
+    """
+    Get a snapshot of everything collected so far.
+
+    Returns:
+        dict: "enabled", "counters" by name, and "timings" by name with the count, total seconds
+            and mean, min, p50, p90, p99 and max in milliseconds.
+    """
+    with _lock:
+        return {
+            "enabled": _enabled,
+            "counters": dict(sorted(_counters.items())),
+            "timings": {name: timing.summary() for name, timing in sorted(_timings.items())},
+        }
+
+def exportJson(path):
+    """Write the current stats() snapshot to a JSON file."""
+    snapshot = stats()
+    snapshot["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(path, "w") as f:
+        json.dump(snapshot, f, indent=2)
+
+def exportCsv(path):
+    """Write the current timings and counters to a CSV file, one row per metric."""
+    snapshot = stats()
+    columns = ["count", "total_s", "mean_ms", "min_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "kind"] + columns)
+        for name, summary in snapshot["timings"].items():
+            writer.writerow([name, "timing"] + [summary[column] for column in columns])
+        for name, value in snapshot["counters"].items():
+            writer.writerow([name, "counter", value] + [""] * (len(columns) - 1))
@@ -1,37 +1,169 @@
 from pynput import mouse, keyboard
 from pynput.mouse import Button, Controller
+import math
 import time
 import json
+import threading
+import numpy as np
+import metricsLib
+from recordingLib import (
+    BINARY_EXTENSION, openEventWriter, iterEvents, countEvents, PathSimplifier, SIMPLIFY_SPATIAL_TOLERANCE,
+    SIMPLIFY_TEMPORAL_TOLERANCE
+)
 
 is_recording = False
 ctrl_pressed = False  # Track the state of the Ctrl key
 
-def moveMouse(target_x, target_y, duration=0.5, steps=50):
+# Deadline scheduling: sleep until this close to each deadline, then yield-spin on the monotonic clock
+SPIN_THRESHOLD = 0.0005
+# Replay: longest gap (seconds) between cursor updates while gliding between two recorded moves
+REPLAY_INTERPOLATION_INTERVAL = 0.008
+
+def _waitUntil(deadline, interrupt_event=None):
+    """
+    Wait until time.perf_counter() reaches the deadline, sleeping coarsely and spinning only at the end.
+
+    The final stretch yields the CPU with time.sleep(0) on every check instead of busy-looping.
+
+    Returns:
+        bool: True once the deadline is reached, False if interrupt_event was set first.
+    """
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return True
+        if remaining > SPIN_THRESHOLD:
+            if interrupt_event is None:
+                time.sleep(remaining - SPIN_THRESHOLD)
+            elif interrupt_event.wait(remaining - SPIN_THRESHOLD):
+                return False
+        else:
+            time.sleep(0)
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def getController():
+    """Return the mouse controller shared by all movement and replay functions."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = Controller()
+        return _controller
+
+def setController(controller):
+    """Replace the shared mouse controller, e.g. with a recording stand-in for benchmarks."""
+    global _controller
+    with _controller_lock:
+        _controller = controller
+
+_keyboard_controller = None
+
+def getKeyboardController():
+    """Return the keyboard controller shared by replays."""
+    global _keyboard_controller
+    with _controller_lock:
+        if _keyboard_controller is None:
+            _keyboard_controller = keyboard.Controller()
+        return _keyboard_controller
+
+def setKeyboardController(controller):
+    """Replace the shared keyboard controller, e.g. with a recording stand-in for benchmarks."""
+    global _keyboard_controller
+    with _controller_lock:
+        _keyboard_controller = controller
+
+# Easing functions map progress in [0, 1] to the fraction of the distance covered
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+    "ease_in_out": lambda t: t * t * (3 - 2 * t),
+}
+
+def _lineCurve(start, end, progress):
+    """Points along the straight line from start to end."""
+    return start + (end - start) * progress[:, None]
+
+def _arcCurve(start, end, progress):
+    """Points along a gentle quadratic Bezier arc from start to end."""
+    delta = end - start
+    # Bend sideways by a fifth of the distance, like a wrist movement
+    control = (start + end) / 2 + np.array([-delta[1], delta[0]]) * 0.2
+    p = progress[:, None]
+    return (1 - p) ** 2 * start + 2 * (1 - p) * p * control + p ** 2 * end
+
+CURVES = {
+    "line": _lineCurve,
+    "arc": _arcCurve,
+}
+
+def computeTrajectory(start, end, duration=0.5, steps=50, easing="linear", curve="line"):
+    """
+    Precompute a mouse trajectory.
+
+    Args:
+        start (tuple): The (x, y) start position.
+        end (tuple): The (x, y) end position.
+        duration (float): Total time (in seconds) of the movement. Default is 0.5 seconds.
+        steps (int): Number of points along the movement. Default is 50.
+        easing (str or callable): A name from EASINGS, or a function mapping progress arrays in [0, 1]
+            to [0, 1]. Default is "linear".
+        curve (str or callable): A name from CURVES, or a function (start, end, progress) returning
+            an (N, 2) array of points. Default is "line".
+
+    Returns:
+        numpy.ndarray: An (N, 3) array of (time offset, x, y) rows; the last row is the end position at `duration`.
+    """
+    easing = EASINGS[easing] if isinstance(easing, str) else easing
+    curve = CURVES[curve] if isinstance(curve, str) else curve
+    steps = max(1, int(steps))
+
+    times = np.arange(1, steps + 1, dtype=np.float64) * (duration / steps)
+    progress = easing(np.arange(1, steps + 1, dtype=np.float64) / steps)
+    points = curve(np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64), progress)
+
+    trajectory = np.empty((steps, 3), dtype=np.float64)
+    trajectory[:, 0] = times
+    trajectory[:, 1:] = np.rint(points)
+    trajectory[-1, 1:] = end  # Always land exactly on the target
+    return trajectory
+
+def moveMouse(target_x, target_y, duration=0.5, steps=50, easing="linear", curve="line"):
     """
     Move the mouse smoothly to the specified position.
 
+    Every point is scheduled against an absolute deadline; points whose successor is already due
+    are skipped rather than delaying the rest of the movement, so the move finishes on time.
+
     Args:
         target_x (int): The target x-coordinate.
         target_y (int): The target y-coordinate.
         duration (float): Total time (in seconds) to move the mouse. Default is 0.5 seconds.
         steps (int): Number of intermediate steps for the movement. Default is 50.
+        easing (str or callable): Speed profile, a name from EASINGS. Default is "linear".
+        curve (str or callable): Path shape, a name from CURVES. Default is "line".
     """
-    mouse = Controller()
-    start_x, start_y = mouse.position
-    step_duration = duration / steps
+    mouse = getController()
+    trajectory = computeTrajectory(mouse.position, (target_x, target_y), duration, steps, easing, curve)
+    last_index = len(trajectory) - 1
 
-    for step in range(1, steps + 1):
-        # Interpolate position
-        current_x = start_x + (target_x - start_x) * step / steps
-        current_y = start_y + (target_y - start_y) * step / steps
-        mouse.position = (int(current_x), int(current_y))
-
-        # Wait for the next step
-        time.sleep(step_duration)
+    start_time = time.perf_counter()
+    for index in range(len(trajectory)):
+        # Skip this point if the next one is already due
+        if index < last_index and time.perf_counter() >= start_time + trajectory[index + 1, 0]:
+            metricsLib.count("mouse.move_points_skipped")
+            continue
+        deadline = start_time + trajectory[index, 0]
+        with metricsLib.timed("mouse.move_wait"):
+            _waitUntil(deadline)
+        mouse.position = (int(trajectory[index, 1]), int(trajectory[index, 2]))
+        metricsLib.record("mouse.move_lateness", time.perf_counter() - deadline)
 
     print(f"Mouse moved to ({target_x}, {target_y})")
 
-def moveMouseClick(target_x, target_y, click_type="left", double=False, duration=0.5, steps=50):
+def moveMouseClick(target_x, target_y, click_type="left", double=False, duration=0.5, steps=50, easing="linear",
+                   curve="line"):
     """
     Move the mouse smoothly to the specified position and perform a click.
 
@@ -42,12 +174,14 @@ def moveMouseClick(target_x, target_y, click_type="left", double=False, duration
         double (bool): Whether to perform a double-click. Default is False.
         duration (float): Total time (in seconds) to move the mouse. Default is 0.5 seconds.
         steps (int): Number of intermediate steps for the movement. Default is 50.
+        easing (str or callable): Speed profile, a name from EASINGS. Default is "linear".
+        curve (str or callable): Path shape, a name from CURVES. Default is "line".
     """
     # Move the mouse to the target position
-    moveMouse(target_x, target_y, duration, steps)
+    moveMouse(target_x, target_y, duration, steps, easing, curve)
 
     # Perform the specified click
-    mouse = Controller()
+    mouse = getController()
 
     if click_type == "left":
         if double:
@@ -65,30 +199,88 @@ def moveMouseClick(target_x, target_y, click_type="left", double=False, duration
 
     print(f"Mouse moved to ({target_x}, {target_y}) and performed a {'double' if double else 'single'} {click_type}-click.")
 
-def recordMouseEvents(output_file):
+def _keyToString(key):
+    """Serialize a pynput key as "Key.<name>" for special keys, the character itself, or "<vk>"."""
+    if isinstance(key, keyboard.Key):
+        return str(key)
+    if getattr(key, "char", None) is not None:
+        return key.char
+    return f"<{key.vk}>"
+
+def _keyFromString(name):
+    """Parse a key serialized by _keyToString, returning None if this platform's pynput has no such key."""
+    try:
+        if name.startswith("Key.") and len(name) > 4:
+            return keyboard.Key[name[4:]]
+        if name.startswith("<") and name.endswith(">") and len(name) > 2:
+            return keyboard.KeyCode.from_vk(int(name[1:-1]))
+        return keyboard.KeyCode.from_char(name)
+    except (KeyError, ValueError):
+        return None
+
+_CTRL_KEYS = (keyboard.Key.ctrl_l, keyboard.Key.ctrl_r)
+
+def recordMouseEvents(output_file, simplify=False, spatial_tolerance=SIMPLIFY_SPATIAL_TOLERANCE,
+                      temporal_tolerance=SIMPLIFY_TEMPORAL_TOLERANCE, record_keys=False):
     """
     Record mouse events and save them to a file, filtering unnecessary move events.
 
+    Files ending in ".mrec" (compact binary) or ".jsonl" (line-delimited JSON) are appended to
+    while recording runs; any other name is saved as JSON when recording stops. Events carry a
+    "time_ns" offset from time.perf_counter_ns() alongside the "time" offset in seconds.
+
     Args:
         output_file (str): The path to the file where mouse events will be saved.
+        simplify (bool): Simplify mouse paths while recording, keeping every click and scroll. Default is False.
+        spatial_tolerance (float): How far (in pixels) a dropped move may be from the simplified path. Default is 2.0.
+        temporal_tolerance (float): How far (in seconds) the simplified path may be from a dropped move's time. Default is 0.02.
+        record_keys (bool): Also record key presses and releases into the same timeline. Default is False.
     """
     global is_recording, ctrl_pressed
+    if record_keys and output_file.lower().endswith(BINARY_EXTENSION):
+        raise ValueError("Binary recordings hold mouse events only; record keys to a .json or .jsonl file.")
+
+    writer = openEventWriter(output_file)
     events = []
-    start_time = time.time()
+    record_event = writer.append if writer is not None else events.append
+    simplifier = None
+    if simplify:
+        simplifier = PathSimplifier(record_event, spatial_tolerance, temporal_tolerance)
+        record_event = simplifier.append
+    start_time_ns = time.perf_counter_ns()
     last_move = {"x": None, "y": None}  # Track last recorded move
+    # Listeners run on separate threads; timestamping under one lock keeps the file in time order
+    record_lock = threading.Lock()
+    pending_ctrl = []  # Ctrl presses held back until we know they aren't part of the Ctrl+F1 hotkey
+    pressed_keys = set()  # Keys whose press was recorded, so stray releases can be ignored
+
+    def record(event):
+        with record_lock:
+            elapsed_ns = time.perf_counter_ns() - start_time_ns
+            event["time"] = elapsed_ns / 1e9
+            event["time_ns"] = elapsed_ns
+            record_event(event)
+
+    def record_key(key_name, pressed):
+        if pressed:
+            pressed_keys.add(key_name)
+        elif key_name in pressed_keys:
+            pressed_keys.discard(key_name)
+        else:
+            return
+        record({"type": "key", "key": key_name, "pressed": pressed})
 
     def on_move(x, y):
         if is_recording:
             # Record only if moved significantly or if this is the first move
             if last_move["x"] is None or abs(x - last_move["x"]) > 2 or abs(y - last_move["y"]) > 2:
-                events.append({"type": "move", "time": time.time() - start_time, "x": x, "y": y})
+                record({"type": "move", "x": x, "y": y})
                 last_move["x"], last_move["y"] = x, y
 
     def on_click(x, y, button, pressed):
         if is_recording:
-            events.append({
+            record({
                 "type": "click",
-                "time": time.time() - start_time,
                 "x": x,
                 "y": y,
                 "button": str(button),
@@ -97,9 +289,8 @@ def recordMouseEvents(output_file):
 
     def on_scroll(x, y, dx, dy):
         if is_recording:
-            events.append({
+            record({
                 "type": "scroll",
-                "time": time.time() - start_time,
                 "x": x,
                 "y": y,
                 "dx": dx,
@@ -109,26 +300,48 @@ def recordMouseEvents(output_file):
     def on_key_press(key):
         global is_recording, ctrl_pressed
         try:
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
+            if key in _CTRL_KEYS:
                 ctrl_pressed = True
+                if is_recording and record_keys:
+                    pending_ctrl.append(_keyToString(key))
             elif key == keyboard.Key.f1 and ctrl_pressed:
+                pending_ctrl.clear()  # That Ctrl belonged to the hotkey
                 is_recording = not is_recording
                 if is_recording:
                     print("Recording started.")
                 else:
                     print("Recording stopped.")
                     # Save events and stop both listeners
-                    with open(output_file, "w") as f:
-                        json.dump(events, f)
+                    with record_lock:
+                        if simplifier is not None:
+                            simplifier.flush()
+                            print(f"Mouse paths simplified {simplifier.ratio():.1f}:1.")
+                        if writer is not None:
+                            writer.close()
+                        else:
+                            with open(output_file, "w") as f:
+                                json.dump(events, f)
                     print(f"Mouse events recorded and saved to {output_file}")
                     return False
+            elif is_recording and record_keys:
+                for ctrl_name in pending_ctrl:
+                    record_key(ctrl_name, True)
+                pending_ctrl.clear()
+                record_key(_keyToString(key), True)
         except AttributeError:
             pass
 
     def on_key_release(key):
         global ctrl_pressed
-        if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
+        if key in _CTRL_KEYS:
             ctrl_pressed = False
+            if pending_ctrl:
+                # A lone Ctrl tap: record the press it was holding back
+                for ctrl_name in pending_ctrl:
+                    record_key(ctrl_name, True)
+                pending_ctrl.clear()
+        if is_recording and record_keys:
+            record_key(_keyToString(key), False)
 
     print("Press 'Ctrl+F1' to start/stop recording.")
     
@@ -138,48 +351,252 @@ def recordMouseEvents(output_file):
         keyboard_listener.join()
         mouse_listener.stop()
 
-def replayMouseEvents(input_file):
+def recordInputEvents(output_file, simplify=False, spatial_tolerance=SIMPLIFY_SPATIAL_TOLERANCE,
+                      temporal_tolerance=SIMPLIFY_TEMPORAL_TOLERANCE):
     """
-    Replay mouse events from a file using pynput for faster performance.
+    Record mouse and keyboard events into a single timeline and save them to a file.
 
     Args:
-        input_file (str): The path to the file containing recorded mouse events.
+        output_file (str): The path to the JSON or ".jsonl" file where events will be saved.
+        simplify (bool): Simplify mouse paths while recording, keeping every click, scroll and key. Default is False.
+        spatial_tolerance (float): How far (in pixels) a dropped move may be from the simplified path. Default is 2.0.
+        temporal_tolerance (float): How far (in seconds) the simplified path may be from a dropped move's time. Default is 0.02.
     """
-    # Load recorded events
-    with open(input_file, "r") as f:
-        events = json.load(f)
+    recordMouseEvents(output_file, simplify, spatial_tolerance, temporal_tolerance, record_keys=True)
 
-    mouse = Controller()
-    replay_start_time = time.time()
+_BUTTONS = {"Button.left": Button.left, "Button.right": Button.right, "Button.middle": Button.middle}
 
-    for event in events:
-        # Synchronize timing
-        target_time = replay_start_time + event["time"]
-        while time.time() < target_time:
-            pass  # Busy-wait to synchronize timing (minimize overhead)
+def _eventTime(event):
+    """Return an event's offset in seconds, preferring the nanosecond timestamp when it was recorded."""
+    time_ns = event.get("time_ns")
+    return time_ns / 1e9 if time_ns is not None else event["time"]
 
-        # Handle move events
-        if event["type"] == "move":
-            mouse.position = (event["x"], event["y"])
+def _applyEvent(controller, event, keyboard_controller=None):
+    """
+    Perform one recorded event with the given mouse and keyboard controllers.
+
+    Returns:
+        bool: False if the event was skipped because its key doesn't exist on this platform.
+    """
+    # Handle move events
+    if event["type"] == "move":
+        controller.position = (event["x"], event["y"])
 
-        # Handle click events
-        elif event["type"] == "click":
+    # Handle click events
+    elif event["type"] == "click":
+        button = _BUTTONS.get(event["button"])
+        if button is not None:
             if event["pressed"]:
-                if event["button"] == "Button.left":
-                    mouse.press(Button.left)
-                elif event["button"] == "Button.right":
-                    mouse.press(Button.right)
+                controller.press(button)
             else:
-                if event["button"] == "Button.left":
-                    mouse.release(Button.left)
-                elif event["button"] == "Button.right":
-                    mouse.release(Button.right)
+                controller.release(button)
 
-        # Handle scroll events
-        elif event["type"] == "scroll":
-            mouse.scroll(0, event["dy"])
+    # Handle scroll events
+    elif event["type"] == "scroll":
+        controller.scroll(0, event["dy"])
+
+    # Handle key events
+    elif event["type"] == "key" and keyboard_controller is not None:
+        key = _keyFromString(event["key"])
+        if key is None:
+            # E.g. a media key recorded on another OS; skip it rather than abort the replay
+            print(f"Skipping unknown key {event['key']!r}.")
+            return False
+        if event["pressed"]:
+            keyboard_controller.press(key)
+        else:
+            keyboard_controller.release(key)
 
-    print("Mouse events replayed.")
+    return True
+
+class ReplayJob(threading.Thread):
+    """
+    Replay a recording on a background thread with pause, resume, cancel and progress reporting.
+
+    Events are scheduled against absolute deadlines on time.perf_counter(), so pauses and slow
+    events don't accumulate drift. Call run() directly to replay on the current thread instead.
+
+    With interpolate, the cursor glides in a straight line between consecutive moves instead of
+    jumping, so simplified recordings, which keep only the corners of a path, replay smoothly.
+    """
+
+    def __init__(self, input_file, speed=1.0, controller=None, keyboard_controller=None, interpolate=True):
+        super().__init__(daemon=True, name="ReplayJob")
+        if not speed > 0:
+            raise ValueError(f"Replay speed must be positive, got {speed}")
+        self.input_file = input_file
+        self.speed = speed
+        self.controller = controller
+        self.keyboard_controller = keyboard_controller
+        self.interpolate = interpolate
+        self.completed = 0
+        self.total = 0
+        self.max_lateness = 0.0
+        self.cancelled = False
+        self._running = threading.Event()
+        self._running.set()
+        self._cancel_event = threading.Event()
+        self._interrupt_event = threading.Event()
+
+    def pause(self):
+        """Pause the replay before the next event."""
+        self._running.clear()
+        self._interrupt_event.set()
+
+    def resume(self):
+        """Resume a paused replay, keeping the remaining events' relative timing."""
+        self._running.set()
+
+    def cancel(self):
+        """Stop the replay and release any buttons and keys it is holding."""
+        self._cancel_event.set()
+        self._running.set()
+        self._interrupt_event.set()
+
+    def isPaused(self):
+        return not self._running.is_set()
+
+    def progress(self):
+        """Return the fraction of events replayed so far, between 0 and 1 (0 while the total is unknown)."""
+        return self.completed / self.total if self.total else 0.0
+
+    def _waitFor(self, target_time):
+        """
+        Wait until target_time seconds into the replay, shifting the schedule by any pause.
+
+        Returns:
+            bool: True once the time is reached, False if the replay was cancelled.
+        """
+        while True:
+            self._interrupt_event.clear()
+            if self._cancel_event.is_set():
+                return False
+            if not self._running.is_set():
+                # Shift the schedule by however long the pause lasted
+                pause_start = time.perf_counter()
+                self._running.wait()
+                self._start_time += time.perf_counter() - pause_start
+                continue
+            if _waitUntil(self._start_time + target_time, self._interrupt_event):
+                return True
+
+    def _glide(self, controller, previous, target_time, event):
+        """
+        Move the cursor through evenly timed points between the previous move and this one.
+
+        Returns:
+            bool: False if the replay was cancelled on the way.
+        """
+        start_time, start_x, start_y = previous
+        gap = target_time - start_time
+        steps = math.ceil(gap / REPLAY_INTERPOLATION_INTERVAL)
+        position = (start_x, start_y)
+        for step in range(1, steps):
+            point_time = start_time + step * REPLAY_INTERPOLATION_INTERVAL
+            # Drop points that are already overdue, as moveMouse does, so a late replay catches up
+            if time.perf_counter() >= self._start_time + point_time + REPLAY_INTERPOLATION_INTERVAL:
+                continue
+            fraction = (point_time - start_time) / gap
+            point = (int(round(start_x + fraction * (event["x"] - start_x))),
+                     int(round(start_y + fraction * (event["y"] - start_y))))
+            if point == position:
+                continue
+            if not self._waitFor(point_time):
+                return False
+            controller.position = point
+            position = point
+            metricsLib.count("replay.interpolated_moves")
+        return True
+
+    def run(self):
+        # Stream events from disk so memory stays flat and the first event plays immediately
+        events = iterEvents(self.input_file)
+        self.total = countEvents(self.input_file) or 0
+        controller = self.controller or getController()
+        keyboard_controller = self.keyboard_controller or getKeyboardController()
+        held_buttons = set()
+        held_keys = set()
+
+        try:
+            self._start_time = time.perf_counter()
+            previous_move = None  # (time, x, y) of the previous event when it was a move
+            for event in events:
+                target_time = _eventTime(event) / self.speed
+                is_move = event["type"] == "move"
+                glided = True
+                if is_move and self.interpolate and previous_move is not None:
+                    glided = self._glide(controller, previous_move, target_time, event)
+                if not glided or not self._waitFor(target_time):
+                    self.cancelled = True
+                    break
+                previous_move = (target_time, event["x"], event["y"]) if is_move else None
+
+                lateness = time.perf_counter() - (self._start_time + target_time)
+                self.max_lateness = max(self.max_lateness, lateness)
+                metricsLib.record("replay.lateness", lateness)
+                applied = _applyEvent(controller, event, keyboard_controller)
+                if applied and event["type"] in ("click", "key"):
+                    held = held_buttons if event["type"] == "click" else held_keys
+                    name = event["button"] if event["type"] == "click" else event["key"]
+                    if event["pressed"]:
+                        held.add(name)
+                    else:
+                        held.discard(name)
+                self.completed += 1
+        finally:
+            # Never leave buttons or keys held down, even when an event fails to replay
+            for button_name in held_buttons:
+                if button_name in _BUTTONS:
+                    controller.release(_BUTTONS[button_name])
+            for key_name in held_keys:
+                keyboard_controller.release(_keyFromString(key_name))
+            events.close()
+
+        self.total = max(self.total, self.completed)
+
+        if self.cancelled:
+            print(f"Replay cancelled after {self.completed} events.")
+        else:
+            print(f"Mouse events replayed (max lateness {self.max_lateness * 1000:.2f} ms).")
+
+def startReplay(input_file, speed=1.0, interpolate=True):
+    """
+    Start replaying mouse events on a background thread.
+
+    Args:
+        input_file (str): The path to the file containing recorded mouse events (JSON, line-delimited JSON or binary).
+        speed (float): Playback speed multiplier; 2.0 replays twice as fast. Default is 1.0.
+        interpolate (bool): Glide the cursor between recorded moves instead of jumping. Default is True.
+
+    Returns:
+        ReplayJob: The running job, which can be paused, resumed or cancelled.
+    """
+    job = ReplayJob(input_file, speed=speed, interpolate=interpolate)
+    job.start()
+    return job
+
+def replayMouseEvents(input_file, speed=1.0, interpolate=True):
+    """
+    Replay mouse events from a file using pynput for faster performance.
+
+    Args:
+        input_file (str): The path to the file containing recorded mouse events (JSON, line-delimited JSON or binary).
+        speed (float): Playback speed multiplier; 2.0 replays twice as fast. Default is 1.0.
+        interpolate (bool): Glide the cursor between recorded moves instead of jumping. Default is True.
+    """
+    ReplayJob(input_file, speed=speed, interpolate=interpolate).run()
+
+def replayInputEvents(input_file, speed=1.0):
+    """
+    Replay a mixed mouse and keyboard timeline recorded with recordInputEvents.
+
+    Keys and mouse events share one scheduler, so they keep their recorded order and relative timing.
+
+    Args:
+        input_file (str): The path to the file containing the recorded events.
+        speed (float): Playback speed multiplier; 2.0 replays twice as fast. Default is 1.0.
+    """
+    replayMouseEvents(input_file, speed=speed)
 
 
 # Example usage
@@ -0,0 +1,266 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import pytesseract
+from captureLib import getCaptureBackend
+import metricsLib
+
+# Frames are OCR'd in full-width horizontal bands that overlap by enough to hold a line of text,
+# so every line lies entirely inside at least one band
+OCR_TILE_HEIGHT = 160
+OCR_TILE_OVERLAP = 48
+# Screen text is small for Tesseract; upscaling before recognition improves accuracy noticeably
+OCR_SCALE = 2
+OCR_WORKERS = os.cpu_count() or 1
+# OpenMP threads per Tesseract process. OCR_WORKERS processes already run one band each, so more only
+# oversubscribes the CPU. pytesseract passes the environment straight to Tesseract, so this is set
+# process-wide as OMP_THREAD_LIMIT the first time OCR runs (other OpenMP subprocesses see it too);
+# an OMP_THREAD_LIMIT already in the environment is left alone. None leaves the environment untouched.
+OCR_THREAD_LIMIT = 1
+
+# Recognised words per band, keyed by a hash of the band's pixels
+_ocr_cache = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+_ocr_cache_size = 256
+_ocr_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+def _ocrPool():
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            if OCR_THREAD_LIMIT is not None:
+                os.environ.setdefault("OMP_THREAD_LIMIT", str(OCR_THREAD_LIMIT))
+            _ocr_pool = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="OCR")
+        return _ocr_pool
+
+def setOcrCacheSize(size):
+    """
+    Set the maximum number of OCR'd bands kept in memory.
+
+    Args:
+        size (int): The maximum number of cached bands. 0 disables caching.
+    """
+    global _ocr_cache_size
+    with _ocr_cache_lock:
+        _ocr_cache_size = max(0, int(size))
+        while len(_ocr_cache) > _ocr_cache_size:
+            _ocr_cache.popitem(last=False)
+            _ocr_cache_stats["evictions"] += 1
+
+def clearOcrCache():
+    """Drop all cached OCR results and reset the hit/miss counters."""
+    with _ocr_cache_lock:
+        _ocr_cache.clear()
+        for name in _ocr_cache_stats:
+            _ocr_cache_stats[name] = 0
+
+def getOcrCacheStats():
+    """
+    Get the OCR cache counters.
+
+    Returns:
+        dict: The hits, misses, evictions, current size and capacity of the cache.
+    """
+    with _ocr_cache_lock:
+        stats = dict(_ocr_cache_stats)
+        stats["size"] = len(_ocr_cache)
+        stats["capacity"] = _ocr_cache_size
+    return stats
+
+def _bands(height):
+    """
+    Split a frame of the given height into overlapping bands.
+
+    Returns:
+        list: (top, bottom, core_top, core_bottom) per band. A word belongs to the band whose core
+            contains its vertical center, so words in an overlap are reported once.
+    """
+    step = OCR_TILE_HEIGHT - OCR_TILE_OVERLAP
+    bands = []
+    top = 0
+    while True:
+        bottom = min(height, top + OCR_TILE_HEIGHT)
+        core_top = 0 if top == 0 else top + OCR_TILE_OVERLAP // 2
+        core_bottom = height if bottom >= height else top + step + OCR_TILE_OVERLAP // 2
+        bands.append((top, bottom, core_top, core_bottom))
+        if bottom >= height:
+            return bands
+        top += step
+
+def _ocrBand(band_gray, lang, config):
+    """
+    Run Tesseract on one band.
+
+    Returns:
+        list: (text, left, top, width, height, confidence, line_key) per word, in band coordinates.
+    """
+    scaled = cv2.resize(band_gray, None, fx=OCR_SCALE, fy=OCR_SCALE, interpolation=cv2.INTER_CUBIC)
+    with metricsLib.timed("ocr.band"):
+        data = pytesseract.image_to_data(scaled, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+    words = []
+    for i, text in enumerate(data["text"]):
+        text = text.strip()
+        confidence = float(data["conf"][i])
+        if not text or confidence < 0:
+            continue
+        words.append((
+            text,
+            data["left"][i] // OCR_SCALE, data["top"][i] // OCR_SCALE,
+            data["width"][i] // OCR_SCALE, data["height"][i] // OCR_SCALE,
+            confidence,
+            (data["block_num"][i], data["par_num"][i], data["line_num"][i]),
+        ))
+    return words
+
+def _bandKey(band_gray, lang, config):
+    digest = hashlib.blake2b(band_gray.tobytes(), digest_size=16).hexdigest()
+    return (digest, band_gray.shape, lang, config)
+
+def _readLines(screen_gray, lang, config):
+    """
+    OCR a frame band by band, reusing cached results for bands whose pixels haven't changed.
+
+    Returns:
+        list: One list of (text, left, top, width, height, confidence) words per line, in frame
+            coordinates and reading order.
+    """
+    bands = _bands(screen_gray.shape[0])
+    band_words = [None] * len(bands)
+    pending = {}
+
+    with _ocr_cache_lock:
+        for index, (top, bottom, core_top, core_bottom) in enumerate(bands):
+            key = _bandKey(screen_gray[top:bottom], lang, config)
+            entry = _ocr_cache.get(key)
+            if entry is not None:
+                _ocr_cache.move_to_end(key)
+                _ocr_cache_stats["hits"] += 1
+                metricsLib.count("ocr.cache_hit")
+                band_words[index] = entry
+            else:
+                _ocr_cache_stats["misses"] += 1
+                metricsLib.count("ocr.cache_miss")
+                pending[index] = key
+
+    # Each band runs in its own Tesseract process, so the work spreads across cores
+    futures = {index: _ocrPool().submit(_ocrBand, screen_gray[bands[index][0]:bands[index][1]], lang, config)
+               for index in pending}
+    for index, future in futures.items():
+        band_words[index] = future.result()
+
+    with _ocr_cache_lock:
+        for index, key in pending.items():
+            _ocr_cache[key] = band_words[index]
+            _ocr_cache.move_to_end(key)
+        while len(_ocr_cache) > _ocr_cache_size:
+            _ocr_cache.popitem(last=False)
+            _ocr_cache_stats["evictions"] += 1
+
+    lines = OrderedDict()
+    for index, (top, bottom, core_top, core_bottom) in enumerate(bands):
+        for text, left, word_top, width, height, confidence, line_key in band_words[index]:
+            if not core_top <= top + word_top + height // 2 < core_bottom:
+                continue
+            lines.setdefault((index,) + line_key, []).append((text, left, top + word_top, width, height, confidence))
+    return sorted(lines.values(), key=lambda words: (min(word[2] for word in words), words[0][1]))
+
+def _findInLine(words, phrase, confidence, case_sensitive):
+    """Return the (x, y, width, height) box of the phrase in a line of words, or None."""
+    texts = [word[0] if case_sensitive else word[0].lower() for word in words]
+    line_text = " ".join(texts)
+    needle = " ".join(phrase.split())
+    if not case_sensitive:
+        needle = needle.lower()
+
+    start = line_text.find(needle)
+    while start >= 0:
+        end = start + len(needle)
+        matched = []
+        offset = 0
+        for word, text in zip(words, texts):
+            if offset < end and offset + len(text) > start:
+                matched.append(word)
+            offset += len(text) + 1
+        if all(word[5] >= confidence for word in matched):
+            x0 = min(word[1] for word in matched)
+            y0 = min(word[2] for word in matched)
+            x1 = max(word[1] + word[3] for word in matched)
+            y1 = max(word[2] + word[4] for word in matched)
+            return (x0, y0, x1 - x0, y1 - y0)
+        start = line_text.find(needle, start + 1)
+    return None
+
+def findText(text, region=None, confidence=60, case_sensitive=False, lang="eng", config=""):
+    """
+    Find text on the screen with OCR.
+
+    Only bands of the screen that changed since the last call are run through Tesseract again,
+    so repeated searches over a mostly static screen are cheap.
+
+    Args:
+        text (str): The word or phrase to find. Phrases must sit on one line of text.
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None (whole screen).
+        confidence (float): The minimum Tesseract confidence (0-100) of every matched word. Default is 60.
+        case_sensitive (bool): Match letter case exactly. Default is False.
+        lang (str): The Tesseract language. Default is "eng".
+        config (str): Extra Tesseract options, e.g. "--psm 6". Default is "".
+
+    Returns:
+        tuple: The center (x, y) coordinates of the first match in reading order, or None if not found.
+    """
+    try:
+        screen_gray = getCaptureBackend().grabGray(region)
+        offset_x, offset_y = (region[0], region[1]) if region is not None else (0, 0)
+
+        for words in _readLines(screen_gray, lang, config):
+            box = _findInLine(words, text, confidence, case_sensitive)
+            if box is not None:
+                return (offset_x + box[0] + box[2] // 2, offset_y + box[1] + box[3] // 2)
+
+        print("Text not found on the screen.")
+        return None
+
+    except pytesseract.TesseractNotFoundError:
+        print("Error: Tesseract is not installed or not on the PATH.")
+        return None
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def waitForText(text, timeout=30, interval=1, region=None, confidence=60, case_sensitive=False, lang="eng", config=""):
+    """
+    Wait for text to appear on the screen.
+
+    Args:
+        text (str): The word or phrase to wait for.
+        timeout (int): The maximum time (in seconds) to wait for the text. Default is 30 seconds.
+        interval (int): The time (in seconds) between each detection attempt. Default is 1 second.
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+        confidence (float): The minimum Tesseract confidence (0-100) of every matched word. Default is 60.
+        case_sensitive (bool): Match letter case exactly. Default is False.
+        lang (str): The Tesseract language. Default is "eng".
+        config (str): Extra Tesseract options. Default is "".
+
+    Returns:
+        tuple: The center (x, y) coordinates of the text, or None if it did not appear.
+    """
+    start_time = time.time()
+
+    while time.time() - start_time < timeout:
+        center_coordinates = findText(text, region=region, confidence=confidence, case_sensitive=case_sensitive,
+                                      lang=lang, config=config)
+        if center_coordinates is not None:
+            print(f"Text found at: {center_coordinates}")
+            return center_coordinates
+
+        time.sleep(interval)  # Wait before trying again
+
+    print("Timed out waiting for the text.")
+    return None
@@ -0,0 +1,527 @@
+import json
+import os
+import struct
+import numpy as np
+
+# Binary recordings: a 16-byte header followed by fixed-width little-endian event records
+BINARY_EXTENSION = ".mrec"
+# Line-delimited JSON recordings: one event object per line
+JSON_LINES_EXTENSION = ".jsonl"
+RECORDING_MAGIC = b"AUTOMREC"
+RECORDING_VERSION = 1
+_HEADER = struct.Struct("<8sHHI")
+
+EVENT_DTYPE = np.dtype([
+    ("type", "u1"),
+    ("button", "u1"),
+    ("pressed", "u1"),
+    ("time", "<f8"),
+    ("x", "<i4"),
+    ("y", "<i4"),
+    ("dx", "<i2"),
+    ("dy", "<i2"),
+])
+
+EVENT_TYPES = {"move": 0, "click": 1, "scroll": 2}
+EVENT_TYPE_NAMES = {code: name for name, code in EVENT_TYPES.items()}
+BUTTONS = {"Button.left": 1, "Button.right": 2, "Button.middle": 3}
+BUTTON_NAMES = {code: name for name, code in BUTTONS.items()}
+
+# Number of events buffered in memory before they are appended to the file
+CHUNK_EVENTS = 256
+
+# Streaming replay: events decoded ahead of the player, and bytes read at a time from JSON files
+READ_AHEAD_EVENTS = 256
+JSON_CHUNK_SIZE = 64 * 1024
+
+def isBinaryRecording(path):
+    """
+    Check whether a file is a binary recording.
+
+    Args:
+        path (str): The path to the recording.
+
+    Returns:
+        bool: True if the file starts with the binary recording header.
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(RECORDING_MAGIC)) == RECORDING_MAGIC
+    except OSError:
+        return False
+
+def _fillRecord(record, event):
+    if event["type"] not in EVENT_TYPES:
+        raise ValueError(f"Binary recordings hold mouse events only, not {event['type']} events")
+    record["type"] = EVENT_TYPES[event["type"]]
+    record["time"] = event["time"]
+    record["x"] = event["x"]
+    record["y"] = event["y"]
+    record["button"] = BUTTONS.get(event.get("button"), 0)
+    record["pressed"] = bool(event.get("pressed", False))
+    record["dx"] = event.get("dx", 0)
+    record["dy"] = event.get("dy", 0)
+
+def eventsToRecords(events):
+    """
+    Convert event dicts in the JSON recording layout to a structured array.
+
+    Args:
+        events (list): Event dicts as produced by recordMouseEvents.
+
+    Returns:
+        numpy.ndarray: The events as an EVENT_DTYPE array.
+    """
+    records = np.zeros(len(events), dtype=EVENT_DTYPE)
+    for i, event in enumerate(events):
+        _fillRecord(records[i], event)
+    return records
+
+def recordToEvent(record):
+    """Convert one EVENT_DTYPE record back to an event dict in the JSON recording layout."""
+    event_type = EVENT_TYPE_NAMES[int(record["type"])]
+    event = {"type": event_type, "time": float(record["time"]), "x": int(record["x"]), "y": int(record["y"])}
+    if event_type == "click":
+        event["button"] = BUTTON_NAMES.get(int(record["button"]), "Button.unknown")
+        event["pressed"] = bool(record["pressed"])
+    elif event_type == "scroll":
+        event["dx"] = int(record["dx"])
+        event["dy"] = int(record["dy"])
+    return event
+
+def recordsToEvents(records):
+    """
+    Convert a structured array of events to event dicts in the JSON recording layout.
+
+    Args:
+        records (numpy.ndarray): An EVENT_DTYPE array.
+
+    Returns:
+        list: The events as dicts.
+    """
+    return [recordToEvent(record) for record in records]
+
+class BinaryEventWriter:
+    """Append events to a binary recording in fixed-size chunks.
+
+    Events are buffered in a preallocated structured array and written out every CHUNK_EVENTS
+    events, so memory stays bounded and at most one chunk is lost if the process dies.
+    """
+
+    def __init__(self, path, chunk_events=CHUNK_EVENTS):
+        self.path = path
+        self.count = 0
+        self._buffer = np.zeros(chunk_events, dtype=EVENT_DTYPE)
+        self._pending = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, 0, EVENT_DTYPE.itemsize))
+        self._file.flush()
+
+    def append(self, event):
+        """Buffer one event dict, writing the chunk out when it is full."""
+        _fillRecord(self._buffer[self._pending], event)
+        self._pending += 1
+        self.count += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Write any buffered events to disk."""
+        if self._pending:
+            self._file.write(self._buffer[:self._pending].tobytes())
+            self._pending = 0
+        self._file.flush()
+
+    def close(self):
+        """Flush the remaining events and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class JsonLinesEventWriter:
+    """Append events to a line-delimited JSON recording, flushing every CHUNK_EVENTS events."""
+
+    def __init__(self, path, chunk_events=CHUNK_EVENTS):
+        self.path = path
+        self.count = 0
+        self._chunk_events = chunk_events
+        self._pending = []
+        self._file = open(path, "w")
+
+    def append(self, event):
+        """Buffer one event dict, writing the chunk out when it is full."""
+        self._pending.append(json.dumps(event))
+        self.count += 1
+        if len(self._pending) >= self._chunk_events:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered events to disk."""
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._pending = []
+        self._file.flush()
+
+    def close(self):
+        """Flush the remaining events and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def openEventWriter(path):
+    """
+    Open a streaming writer for the recording format implied by the file name.
+
+    Args:
+        path (str): The path to the recording.
+
+    Returns:
+        BinaryEventWriter or JsonLinesEventWriter: The writer, or None for plain JSON recordings,
+            which are written in one go.
+    """
+    lower_path = path.lower()
+    if lower_path.endswith(BINARY_EXTENSION):
+        return BinaryEventWriter(path)
+    if lower_path.endswith(JSON_LINES_EXTENSION):
+        return JsonLinesEventWriter(path)
+    return None
+
+def _readHeader(f, path):
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{path} is not a binary recording")
+    magic, version, _, record_size = _HEADER.unpack(header)
+    if magic != RECORDING_MAGIC:
+        raise ValueError(f"{path} is not a binary recording")
+    if version != RECORDING_VERSION or record_size != EVENT_DTYPE.itemsize:
+        raise ValueError(f"{path} uses unsupported recording version {version}")
+
+def readBinaryEvents(path):
+    """
+    Read a binary recording as a numpy structured array.
+
+    A partially written final record, e.g. after a crash, is ignored.
+
+    Args:
+        path (str): The path to the binary recording.
+
+    Returns:
+        numpy.ndarray: The events as an EVENT_DTYPE array.
+    """
+    with open(path, "rb") as f:
+        _readHeader(f, path)
+        data = f.read()
+    count = len(data) // EVENT_DTYPE.itemsize
+    return np.frombuffer(data, dtype=EVENT_DTYPE, count=count)
+
+def loadEvents(path):
+    """
+    Load a whole recording in the JSON, line-delimited JSON or binary format.
+
+    Args:
+        path (str): The path to the recording.
+
+    Returns:
+        list: The events as dicts in the JSON recording layout.
+    """
+    if isBinaryRecording(path):
+        return recordsToEvents(readBinaryEvents(path))
+    if path.lower().endswith(JSON_LINES_EXTENSION):
+        return list(iterEvents(path))
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _iterBinary(f, read_ahead):
+    record_size = EVENT_DTYPE.itemsize
+    while True:
+        data = f.read(record_size * read_ahead)
+        count = len(data) // record_size
+        if count == 0:
+            return
+        for record in np.frombuffer(data, dtype=EVENT_DTYPE, count=count):
+            yield recordToEvent(record)
+
+def _iterJsonLines(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def _iterJsonArray(f, chunk_size):
+    """Decode the objects of a top-level JSON array one at a time, holding only one chunk in memory."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = eof = False
+
+    while True:
+        # Skip whitespace and separators between events
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Recording is not a JSON array")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                event, position = decoder.raw_decode(buffer, position)
+                yield event
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            raise ValueError("Recording ended before the JSON array was closed")
+
+        # The next event is incomplete, so read another chunk
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+def iterEvents(path, read_ahead=READ_AHEAD_EVENTS):
+    """
+    Stream the events of a recording without loading the whole file.
+
+    Memory use is bounded by the read-ahead buffer regardless of the recording's length, and the
+    first event is available as soon as the first chunk has been read.
+
+    Args:
+        path (str): The path to the recording, in the JSON, line-delimited JSON or binary format.
+        read_ahead (int): The number of binary records decoded per read. Default is 256.
+
+    Yields:
+        dict: The events in the JSON recording layout.
+    """
+    if isBinaryRecording(path):
+        with open(path, "rb") as f:
+            _readHeader(f, path)
+            yield from _iterBinary(f, read_ahead)
+    elif path.lower().endswith(JSON_LINES_EXTENSION):
+        with open(path, "r") as f:
+            yield from _iterJsonLines(f)
+    else:
+        with open(path, "r") as f:
+            yield from _iterJsonArray(f, JSON_CHUNK_SIZE)
+
+def countEvents(path):
+    """
+    Count the events of a recording without reading it, where the format allows.
+
+    Args:
+        path (str): The path to the recording.
+
+    Returns:
+        int: The number of events in a binary recording, or None for JSON recordings.
+    """
+    if not isBinaryRecording(path):
+        return None
+    return (os.path.getsize(path) - _HEADER.size) // EVENT_DTYPE.itemsize
+
+def jsonToBinary(json_path, binary_path):
+    """
+    Convert a JSON recording to the binary format.
+
+    Args:
+        json_path (str): The path to the JSON or line-delimited JSON recording.
+        binary_path (str): The path to write the binary recording to.
+
+    Returns:
+        int: The number of events converted.
+    """
+    with BinaryEventWriter(binary_path) as writer:
+        for event in iterEvents(json_path):
+            writer.append(event)
+    return writer.count
+
+def binaryToJson(binary_path, json_path):
+    """
+    Convert a binary recording to the JSON format.
+
+    Args:
+        binary_path (str): The path to the binary recording.
+        json_path (str): The path to write the JSON recording to.
+
+    Returns:
+        int: The number of events converted.
+    """
+    events = recordsToEvents(readBinaryEvents(binary_path))
+    with open(json_path, "w") as f:
+        json.dump(events, f)
+    return len(events)
+
+# Path simplification: how far (pixels) and how early/late (seconds) a dropped move may be from the simplified path,
+# which replay follows by gliding in a straight line between kept moves
+SIMPLIFY_SPATIAL_TOLERANCE = 2.0
+SIMPLIFY_TEMPORAL_TOLERANCE = 0.02
+# Longest run of moves simplified at once, which bounds memory when simplifying online
+SIMPLIFY_MAX_RUN = 4096
+
+def _simplifyMask(xs, ys, ts, spatial_tolerance, temporal_tolerance):
+    """
+    Ramer-Douglas-Peucker over (x, y, t): return a mask of the points to keep.
+
+    A point is dropped only if it lies within spatial_tolerance of the segment between the kept
+    points around it, and the segment reaches that spot within temporal_tolerance of the point's time.
+    """
+    count = len(xs)
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    spatial_tolerance = max(spatial_tolerance, 1e-9)
+    temporal_tolerance = max(temporal_tolerance, 1e-9)
+    stack = [(0, count - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        segment_x, segment_y, segment_t = xs[last] - xs[first], ys[last] - ys[first], ts[last] - ts[first]
+        point_x = xs[first + 1:last] - xs[first]
+        point_y = ys[first + 1:last] - ys[first]
+        point_t = ts[first + 1:last] - ts[first]
+
+        length_sq = segment_x * segment_x + segment_y * segment_y
+        if length_sq > 0:
+            # Position of each point's projection along the segment, from 0 to 1
+            along = np.clip((point_x * segment_x + point_y * segment_y) / length_sq, 0.0, 1.0)
+        elif segment_t > 0:
+            along = np.clip(point_t / segment_t, 0.0, 1.0)
+        else:
+            along = np.zeros(len(point_x))
+        spatial_error = np.hypot(point_x - along * segment_x, point_y - along * segment_y)
+        temporal_error = np.abs(point_t - along * segment_t)
+
+        error = np.maximum(spatial_error / spatial_tolerance, temporal_error / temporal_tolerance)
+        worst = int(np.argmax(error))
+        if error[worst] > 1.0:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return keep
+
+class PathSimplifier:
+    """Simplify runs of move events as they pass through, forwarding everything else untouched.
+
+    Moves are buffered until a click or scroll arrives (or SIMPLIFY_MAX_RUN moves pile up), then the
+    run is simplified and emitted ahead of that event, so clicks and scrolls are never dropped or reordered.
+    """
+
+    def __init__(self, emit, spatial_tolerance=SIMPLIFY_SPATIAL_TOLERANCE,
+                 temporal_tolerance=SIMPLIFY_TEMPORAL_TOLERANCE, max_run=SIMPLIFY_MAX_RUN):
+        self.emit = emit
+        self.spatial_tolerance = spatial_tolerance
+        self.temporal_tolerance = temporal_tolerance
+        self.max_run = max_run
+        self.input_count = 0
+        self.output_count = 0
+        self._moves = []
+
+    def append(self, event):
+        """Take one event, emitting whatever can be emitted already."""
+        self.input_count += 1
+        if event["type"] == "move":
+            self._moves.append(event)
+            if len(self._moves) >= self.max_run:
+                self._flushMoves(keep_last=True)
+        else:
+            self._flushMoves()
+            self._emit(event)
+
+    def flush(self):
+        """Emit any buffered moves."""
+        self._flushMoves()
+
+    def ratio(self):
+        """Return how many input events there were per emitted event."""
+        return self.input_count / self.output_count if self.output_count else 1.0
+
+    def _emit(self, event):
+        self.output_count += 1
+        self.emit(event)
+
+    def _flushMoves(self, keep_last=False):
+        moves = self._moves
+        if not moves:
+            return
+        if len(moves) > 2:
+            xs = np.array([move["x"] for move in moves], dtype=np.float64)
+            ys = np.array([move["y"] for move in moves], dtype=np.float64)
+            ts = np.array([move["time"] for move in moves], dtype=np.float64)
+            keep = _simplifyMask(xs, ys, ts, self.spatial_tolerance, self.temporal_tolerance)
+        else:
+            keep = [True] * len(moves)
+
+        # When a long run is split, its last point starts the next run so the path stays connected
+        last = len(moves) - 1 if keep_last else len(moves)
+        for i in range(last):
+            if keep[i]:
+                self._emit(moves[i])
+        self._moves = [moves[-1]] if keep_last else []
+
+def simplifyEvents(events, spatial_tolerance=SIMPLIFY_SPATIAL_TOLERANCE, temporal_tolerance=SIMPLIFY_TEMPORAL_TOLERANCE):
+    """
+    Drop near-redundant mouse moves from a list of events.
+
+    Args:
+        events (list): Event dicts in the JSON recording layout.
+        spatial_tolerance (float): How far (in pixels) a dropped move may be from the simplified path. Default is 2.0.
+        temporal_tolerance (float): How far (in seconds) the simplified path may be from a dropped move's time. Default is 0.02.
+
+    Returns:
+        list: The simplified events; clicks and scrolls are kept in their original order.
+    """
+    simplified = []
+    simplifier = PathSimplifier(simplified.append, spatial_tolerance, temporal_tolerance)
+    for event in events:
+        simplifier.append(event)
+    simplifier.flush()
+    return simplified
+
+def simplifyRecording(input_file, output_file, spatial_tolerance=SIMPLIFY_SPATIAL_TOLERANCE,
+                      temporal_tolerance=SIMPLIFY_TEMPORAL_TOLERANCE):
+    """
+    Simplify the mouse moves of a recording and save the result.
+
+    Args:
+        input_file (str): The path to the recording to simplify, in any format.
+        output_file (str): The path to save the simplified recording to; its extension picks the format.
+        spatial_tolerance (float): How far (in pixels) a dropped move may be from the simplified path. Default is 2.0.
+        temporal_tolerance (float): How far (in seconds) the simplified path may be from a dropped move's time. Default is 0.02.
+
+    Returns:
+        float: The compression ratio, i.e. input events per output event.
+    """
+    writer = openEventWriter(output_file)
+    events = []
+    simplifier = PathSimplifier(writer.append if writer is not None else events.append,
+                                spatial_tolerance, temporal_tolerance)
+    for event in iterEvents(input_file):
+        simplifier.append(event)
+    simplifier.flush()
+
+    if writer is not None:
+        writer.close()
+    else:
+        with open(output_file, "w") as f:
+            json.dump(events, f)
+
+    print(f"Simplified {simplifier.input_count} events to {simplifier.output_count} ({simplifier.ratio():.1f}:1).")
+    return simplifier.ratio()
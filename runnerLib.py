@@ -0,0 +1,147 @@
+import io
+import multiprocessing
+import sys
+import threading
+import traceback
+
+def _screenCapture():
+    """Let the user select a region of the screen and save it to the captures folder."""
+    from screenLib import selectScreenRegion, captureScreenRegion, nextCapturePath
+    print("Select a region of the screen...")
+    region = selectScreenRegion()
+    if region:
+        captureScreenRegion(region, nextCapturePath("captures"))
+
+def _recordMouse():
+    from mouseLib import recordMouseEvents
+    recordMouseEvents("mouse_events.json")
+
+def _playback():
+    from mouseLib import replayMouseEvents
+    replayMouseEvents("mouse_events.json")
+
+def scriptNamespace(**overrides):
+    """
+    Build the globals that editor scripts run with.
+
+    Args:
+        **overrides: Entries to add or replace, e.g. GUI-bound versions of screenCapture.
+
+    Returns:
+        dict: The automation API available to scripts.
+    """
+    from screenLib import (
+        detectImage, clickOnImage, waitForImage, detectImages, waitForAnyImage, detectAllImages, watchForImage
+    )
+    from featureLib import detectImageScaled, detectImagesScaled
+    from ocrLib import findText, waitForText
+
+    namespace = {
+        'screenCapture': _screenCapture,
+        'recordMouse': _recordMouse,
+        'playback': _playback,
+        'detectImage': detectImage,
+        'clickOnImage': clickOnImage,
+        'waitForImage': waitForImage,
+        'detectImages': detectImages,
+        'waitForAnyImage': waitForAnyImage,
+        'detectAllImages': detectAllImages,
+        'detectImageScaled': detectImageScaled,
+        'detectImagesScaled': detectImagesScaled,
+        'watchForImage': watchForImage,
+        'findText': findText,
+        'waitForText': waitForText,
+    }
+    namespace.update(overrides)
+    return namespace
+
+class _PipeStream(io.TextIOBase):
+    """Text stream that forwards everything written to it over a multiprocessing connection."""
+
+    def __init__(self, connection, name, lock):
+        super().__init__()
+        self.connection = connection
+        self.name = name
+        self.lock = lock
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            # Connection.send isn't thread-safe, and scripts print from pool workers and watcher callbacks
+            with self.lock:
+                self.connection.send((self.name, text))
+        return len(text)
+
+def _runScriptInChild(script, connection, stop_event):
+    """Entry point of the script process: run the script with the usual API, streaming its output back."""
+    # stdout and stderr share the pipe, so they share its lock
+    lock = threading.Lock()
+    sys.stdout = _PipeStream(connection, "stdout", lock)
+    sys.stderr = _PipeStream(connection, "stderr", lock)
+    try:
+        exec(script, scriptNamespace(stop_thread_event=stop_event))
+    except SystemExit:
+        pass
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+    finally:
+        connection.close()
+
+class ScriptProcess:
+    """
+    Run an editor script in a child process instead of a traced thread.
+
+    The script runs at full interpreter speed, its stdout and stderr are streamed back and written
+    to this process's streams, and stop() can always end it: stop_thread_event is set first as a
+    cooperative signal, then the process is terminated if it hasn't exited.
+    """
+
+    def __init__(self, script):
+        context = multiprocessing.get_context("spawn")
+        self.stop_event = context.Event()
+        self._connection, child_connection = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_runScriptInChild, args=(script, child_connection, self.stop_event), daemon=True
+        )
+        self._child_connection = child_connection
+        self._reader = threading.Thread(target=self._forwardOutput, daemon=True, name="ScriptOutput")
+
+    def start(self):
+        """Start the script process and the thread that forwards its output."""
+        self.process.start()
+        # Only the child writes; closing our copy lets the reader see EOF when the child exits
+        self._child_connection.close()
+        self._reader.start()
+
+    def _forwardOutput(self):
+        while True:
+            try:
+                name, text = self._connection.recv()
+            except (EOFError, OSError):
+                break
+            stream = sys.stderr if name == "stderr" else sys.stdout
+            stream.write(text)
+        self._connection.close()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self, timeout=1):
+        """
+        Stop the script, giving it `timeout` seconds to honour stop_thread_event before terminating it.
+
+        Returns:
+            bool: True if the script had to be terminated.
+        """
+        self.stop_event.set()
+        self.process.join(timeout)
+        if not self.process.is_alive():
+            return False
+        self.process.terminate()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        return True
@@ -1,43 +1,330 @@
-import pyautogui
 import cv2
 import numpy as np
 import tkinter as tk
-from PIL import ImageGrab
+import os
 import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from mouseLib import *
+from captureLib import *
+import metricsLib
 
-def detectImage(image_path, confidence=0.8):
+# Decoded grayscale templates, keyed by absolute path and invalidated when the file changes on disk
+_template_cache = OrderedDict()
+_template_cache_lock = threading.Lock()
+_template_cache_size = 64
+_template_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def loadTemplate(image_path):
+    """
+    Load a template image as grayscale, reusing the cached copy while the file is unchanged.
+
+    Args:
+        image_path (str): The path to the template image.
+
+    Returns:
+        numpy.ndarray: The read-only grayscale template, or None if it could not be loaded.
+    """
+    key = os.path.abspath(image_path)
+    try:
+        stat = os.stat(key)
+    except OSError:
+        return None
+    # Re-captured files keep their name, so the modification time and size identify the version
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _template_cache_lock:
+        entry = _template_cache.get(key)
+        if entry is not None and entry[0] == stamp:
+            _template_cache.move_to_end(key)
+            _template_cache_stats["hits"] += 1
+            metricsLib.count("template.cache_hit")
+            return entry[1]
+        _template_cache_stats["misses"] += 1
+    metricsLib.count("template.cache_miss")
+
+    with metricsLib.timed("template.load"):
+        template = cv2.imread(key, cv2.IMREAD_GRAYSCALE)
+    if template is None:
+        return None
+    template.flags.writeable = False  # Shared between callers, so guard against in-place edits
+
+    with _template_cache_lock:
+        _template_cache[key] = (stamp, template)
+        _template_cache.move_to_end(key)
+        while len(_template_cache) > _template_cache_size:
+            _template_cache.popitem(last=False)
+            _template_cache_stats["evictions"] += 1
+
+    return template
+
+def setTemplateCacheSize(size):
+    """
+    Set the maximum number of templates kept in memory.
+
+    Args:
+        size (int): The maximum number of cached templates. 0 disables caching.
+    """
+    global _template_cache_size
+    with _template_cache_lock:
+        _template_cache_size = max(0, int(size))
+        while len(_template_cache) > _template_cache_size:
+            _template_cache.popitem(last=False)
+            _template_cache_stats["evictions"] += 1
+
+def clearTemplateCache():
+    """Drop all cached templates and reset the hit/miss counters."""
+    with _template_cache_lock:
+        _template_cache.clear()
+        for name in _template_cache_stats:
+            _template_cache_stats[name] = 0
+
+def getTemplateCacheStats():
+    """
+    Get the template cache counters.
+
+    Returns:
+        dict: The hits, misses, evictions, current size and capacity of the cache.
+    """
+    with _template_cache_lock:
+        stats = dict(_template_cache_stats)
+        stats["size"] = len(_template_cache)
+        stats["capacity"] = _template_cache_size
+    return stats
+
+# Coarse-to-fine matching: how many coarse hits to refine, and how far to stop shrinking the template
+PYRAMID_CANDIDATES = 3
+PYRAMID_MIN_TEMPLATE_SIZE = 8
+
+# Recent hit locations per template, tried first when detectImage is called with use_last_seen
+LAST_SEEN_HISTORY = 4
+LAST_SEEN_PADDING = 64
+_last_seen = {}
+_last_seen_lock = threading.Lock()
+
+# detectAllImages: hits overlapping a better hit by more than this intersection-over-union are dropped
+NMS_OVERLAP = 0.3
+
+# Adaptive polling: a frame counts as changed when any pixel differs from the last matched frame by
+# more than this many gray levels, so even a small, low-contrast element appearing triggers a match
+FRAME_NOISE_THRESHOLD = 2
+_last_wait_stats = {"frames": 0, "matches": 0, "skipped": 0}
+
+# Parallel matching: cv2.matchTemplate releases the GIL, so the templates of a multi-template check
+# are matched concurrently on a shared thread pool, each over the whole frame
+_match_workers = os.cpu_count() or 1
+_match_pool = None
+_match_pool_lock = threading.Lock()
+_match_thread = threading.local()
+
+def setMatchWorkers(workers):
+    """
+    Set how many threads template matching may use.
+
+    Results do not depend on this setting; only the time taken does.
+
+    Args:
+        workers (int): The number of matching threads. 1 matches on the calling thread. Default is the CPU count.
+    """
+    global _match_workers, _match_pool
+    with _match_pool_lock:
+        old_pool, _match_pool = _match_pool, None
+        _match_workers = max(1, int(workers))
+    if old_pool is not None:
+        old_pool.shutdown(wait=False)
+
+def getMatchWorkers():
+    """Return how many threads template matching may use."""
+    return _match_workers
+
+def _markMatchThread():
+    _match_thread.active = True
+
+def _matchPool():
+    """Return the shared matching pool, or None when matching serially or already on a pool thread."""
+    global _match_pool
+    # Work submitted from a pool thread runs inline, so nested parallel calls can't exhaust the pool
+    if getattr(_match_thread, "active", False):
+        return None
+    with _match_pool_lock:
+        if _match_workers <= 1:
+            return None
+        if _match_pool is None:
+            _match_pool = ThreadPoolExecutor(
+                max_workers=_match_workers, thread_name_prefix="TemplateMatch", initializer=_markMatchThread
+            )
+        return _match_pool
+
+def _mapMatches(function, items):
+    """Apply function to every item on the matching pool and return the results in order."""
+    pool = _matchPool()
+    if pool is None or len(items) < 2:
+        return [function(item) for item in items]
+    return list(pool.map(function, items))
+
+def _correlationMap(screen_gray, template):
+    """Return the TM_CCOEFF_NORMED score of the template at every position of the screen."""
+    with metricsLib.timed("screen.matchTemplate"):
+        return cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+
+def _grabScreenGray(region=None):
+    """Capture the screen, or the given (x, y, width, height) region of it, as a grayscale array."""
+    with metricsLib.timed("screen.capture"):
+        return getCaptureBackend().grabGray(region)
+
+def _matchExhaustive(screen_gray, template):
+    """Match the template at every position of the screen and return (score, top_left)."""
+    result = _correlationMap(screen_gray, template)
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+def _matchPyramid(screen_gray, template, pyramid_levels):
+    """
+    Match on downscaled copies first and refine the best candidates at full resolution.
+
+    The returned score is always a full-resolution TM_CCOEFF_NORMED value, so it can be
+    compared against the same confidence threshold as an exhaustive match.
+    """
+    template_height, template_width = template.shape
+    screen_height, screen_width = screen_gray.shape
+
+    # Don't shrink the template so far that it loses its detail
+    levels = 0
+    while levels < pyramid_levels and min(template_height, template_width) >> (levels + 1) >= PYRAMID_MIN_TEMPLATE_SIZE:
+        levels += 1
+    if levels == 0:
+        return _matchExhaustive(screen_gray, template)
+
+    small_screen, small_template = screen_gray, template
+    for _ in range(levels):
+        small_screen = cv2.pyrDown(small_screen)
+        small_template = cv2.pyrDown(small_template)
+    with metricsLib.timed("screen.matchTemplate.coarse"):
+        coarse = cv2.matchTemplate(small_screen, small_template, cv2.TM_CCOEFF_NORMED)
+
+    scale = 2 ** levels
+    padding = 2 * scale  # Covers the rounding of pyrDown at every level
+    small_height, small_width = small_template.shape
+    best_val, best_loc = -1.0, None
+
+    for _ in range(PYRAMID_CANDIDATES):
+        min_val, coarse_val, min_loc, coarse_loc = cv2.minMaxLoc(coarse)
+        if coarse_val <= -1.0:
+            break
+
+        # Refine in a small full-resolution window around the coarse hit
+        x0 = max(0, coarse_loc[0] * scale - padding)
+        y0 = max(0, coarse_loc[1] * scale - padding)
+        x1 = min(screen_width, coarse_loc[0] * scale + template_width + padding)
+        y1 = min(screen_height, coarse_loc[1] * scale + template_height + padding)
+        if x1 - x0 >= template_width and y1 - y0 >= template_height:
+            fine_val, fine_loc = _matchExhaustive(screen_gray[y0:y1, x0:x1], template)
+            if fine_val > best_val:
+                best_val, best_loc = fine_val, (x0 + fine_loc[0], y0 + fine_loc[1])
+
+        # Blank out this candidate so the next iteration picks a different location
+        cx0 = max(0, coarse_loc[0] - small_width // 2)
+        cy0 = max(0, coarse_loc[1] - small_height // 2)
+        coarse[cy0:coarse_loc[1] + small_height // 2 + 1, cx0:coarse_loc[0] + small_width // 2 + 1] = -1.0
+
+    if best_loc is None:
+        return _matchExhaustive(screen_gray, template)
+    return best_val, best_loc
+
+def _matchTemplate(screen_gray, template, pyramid_levels=0):
+    """Match the template on the screen, returning (score, top_left)."""
+    if pyramid_levels > 0:
+        return _matchPyramid(screen_gray, template, pyramid_levels)
+    return _matchExhaustive(screen_gray, template)
+
+def _rememberLocation(image_path, location):
+    """Record the top-left screen location of a hit for the given template."""
+    key = os.path.abspath(image_path)
+    with _last_seen_lock:
+        history = _last_seen.setdefault(key, deque(maxlen=LAST_SEEN_HISTORY))
+        if location in history:
+            history.remove(location)
+        history.append(location)
+
+def _recentLocations(image_path):
+    """Return the remembered top-left locations for the given template, most recent first."""
+    with _last_seen_lock:
+        history = _last_seen.get(os.path.abspath(image_path))
+        return list(reversed(history)) if history else []
+
+def clearLastSeen(image_path=None):
+    """
+    Forget remembered hit locations.
+
+    Args:
+        image_path (str): The template to forget. Default is None, which forgets all templates.
+    """
+    with _last_seen_lock:
+        if image_path is None:
+            _last_seen.clear()
+        else:
+            _last_seen.pop(os.path.abspath(image_path), None)
+
+def _paddedWindow(location, template_shape, bounds):
+    """Return a capture region around a previous hit, clipped to the (x, y, width, height) bounds."""
+    template_height, template_width = template_shape
+    bound_x, bound_y, bound_width, bound_height = bounds
+    x0 = max(bound_x, location[0] - LAST_SEEN_PADDING)
+    y0 = max(bound_y, location[1] - LAST_SEEN_PADDING)
+    x1 = min(bound_x + bound_width, location[0] + template_width + LAST_SEEN_PADDING)
+    y1 = min(bound_y + bound_height, location[1] + template_height + LAST_SEEN_PADDING)
+    if x1 - x0 < template_width or y1 - y0 < template_height:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+def _locateInFrame(screen_gray, template, confidence, pyramid_levels=0, region=None):
+    """Match the template on a captured frame and return its top-left screen location, or None."""
+    max_val, max_loc = _matchTemplate(screen_gray, template, pyramid_levels)
+
+    # Check if the detected match exceeds the confidence threshold
+    if max_val < confidence:
+        return None
+    offset_x, offset_y = (region[0], region[1]) if region is not None else (0, 0)
+    return (offset_x + max_loc[0], offset_y + max_loc[1])
+
+def detectImage(image_path, confidence=0.8, pyramid_levels=0, region=None, use_last_seen=False):
     """
     Detect the given image on the screen.
 
     Args:
         image_path (str): The path to the image to detect.
         confidence (float): The confidence threshold for matching. Default is 0.8.
+        pyramid_levels (int): Number of times to halve the screen and template for a coarse-to-fine search.
+            Default is 0, which matches exhaustively at full resolution.
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None (whole screen).
+        use_last_seen (bool): Search around the locations where the image was recently found before
+            falling back to a full search. Default is False.
 
     Returns:
         tuple: The center (x, y) coordinates of the detected image, or None if not found.
     """
     try:
-        # Capture a screenshot of the screen
-        screenshot = pyautogui.screenshot()
-        screen_array = np.array(screenshot)
-        screen_gray = cv2.cvtColor(screen_array, cv2.COLOR_BGR2GRAY)
-
         # Load the target image
-        template = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        template = loadTemplate(image_path)
         if template is None:
             print("Error: Could not load the image. Please check the image path.")
             return None
+        template_height, template_width = template.shape
 
-        # Match the template with the screen
-        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        # Capture a screenshot of the screen once; recent locations are searched in crops of it
+        screen_gray = _grabScreenGray(region)
+        match_loc = None
+        if use_last_seen:
+            match_loc = _locateNearRecent(screen_gray, image_path, template, confidence, region)
+        if match_loc is None:
+            match_loc = _locateInFrame(screen_gray, template, confidence, pyramid_levels, region)
 
-        # Check if the detected match exceeds the confidence threshold
-        if max_val >= confidence:
-            template_height, template_width = template.shape
-            center_x = max_loc[0] + template_width // 2
-            center_y = max_loc[1] + template_height // 2
+        if match_loc is not None:
+            if use_last_seen:
+                _rememberLocation(image_path, match_loc)
+            center_x = match_loc[0] + template_width // 2
+            center_y = match_loc[1] + template_height // 2
             return (center_x, center_y)
 
         print("Image not found on the screen.")
@@ -47,7 +334,248 @@ def detectImage(image_path, confidence=0.8):
         print(f"An error occurred: {e}")
         return None
 
-def waitForImage(image_path, confidence=0.8, timeout=30, interval=1):
+def detectImages(image_paths, confidence=0.8, pyramid_levels=0, region=None):
+    """
+    Detect several images on a single screenshot.
+
+    Args:
+        image_paths (list): The paths to the images to detect.
+        confidence (float): The confidence threshold for matching. Default is 0.8.
+        pyramid_levels (int): Number of pyramid levels for a coarse-to-fine search. Default is 0 (exhaustive).
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+
+    Returns:
+        dict: The center (x, y) coordinates of each image, keyed by its path, or None for images that were not found.
+    """
+    results = {image_path: None for image_path in image_paths}
+    try:
+        # One capture serves every template, so they all see the same frame
+        screen_gray = _grabScreenGray(region)
+
+        def locate(image_path):
+            template = loadTemplate(image_path)
+            if template is None:
+                print(f"Error: Could not load the image {image_path}. Please check the image path.")
+                return None
+
+            match_loc = _locateInFrame(screen_gray, template, confidence, pyramid_levels, region)
+            if match_loc is None:
+                return None
+            template_height, template_width = template.shape
+            return (match_loc[0] + template_width // 2, match_loc[1] + template_height // 2)
+
+        # Templates are matched concurrently on the matching pool
+        image_paths = list(results)
+        results.update(zip(image_paths, _mapMatches(locate, image_paths)))
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    return results
+
+def _nonMaxSuppression(xs, ys, scores, template_shape, max_results=None):
+    """Greedily keep the best hits and drop those overlapping them, returning indices sorted by score."""
+    template_height, template_width = template_shape
+    area = template_width * template_height
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+
+    while order.size and (max_results is None or len(keep) < max_results):
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        # All boxes share the template size, so the overlap only depends on the offsets
+        overlap_x = np.clip(template_width - np.abs(xs[rest] - xs[best]), 0, None)
+        overlap_y = np.clip(template_height - np.abs(ys[rest] - ys[best]), 0, None)
+        intersection = overlap_x * overlap_y
+        iou = intersection / (2 * area - intersection)
+        order = rest[iou <= NMS_OVERLAP]
+
+    return keep
+
+def detectAllImages(image_path, confidence=0.8, max_results=None, region=None):
+    """
+    Detect every instance of the given image on the screen.
+
+    Args:
+        image_path (str): The path to the image to detect.
+        confidence (float): The confidence threshold for matching. Default is 0.8.
+        max_results (int): The maximum number of instances to return. Default is None (no limit).
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+
+    Returns:
+        list: The center (x, y) coordinates of each instance, best match first. Empty if none were found.
+    """
+    try:
+        template = loadTemplate(image_path)
+        if template is None:
+            print("Error: Could not load the image. Please check the image path.")
+            return []
+
+        screen_gray = _grabScreenGray(region)
+        result = _correlationMap(screen_gray, template)
+
+        # Only local maxima above the threshold are candidates, which keeps the suppression step small
+        peaks = (result >= confidence) & (result == cv2.dilate(result, np.ones((3, 3), np.uint8)))
+        ys, xs = np.nonzero(peaks)
+        if xs.size == 0:
+            print("Image not found on the screen.")
+            return []
+
+        keep = _nonMaxSuppression(xs, ys, result[ys, xs], template.shape, max_results)
+
+        template_height, template_width = template.shape
+        offset_x, offset_y = (region[0], region[1]) if region is not None else (0, 0)
+        return [(int(offset_x + xs[i] + template_width // 2), int(offset_y + ys[i] + template_height // 2))
+                for i in keep]
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return []
+
+def comparePyramidMatching(image_paths, pyramid_levels=2, confidence=0.8):
+    """
+    Compare pyramid matching against exhaustive matching on a single screenshot.
+
+    Args:
+        image_paths (list): The paths of the images to compare.
+        pyramid_levels (int): Number of pyramid levels to evaluate. Default is 2.
+        confidence (float): The confidence threshold for matching. Default is 0.8.
+
+    Returns:
+        list: One dict per image with both scores and locations, timings, and whether the results agree.
+    """
+    screen_gray = _grabScreenGray()
+    report = []
+
+    for image_path in image_paths:
+        template = loadTemplate(image_path)
+        if template is None:
+            print(f"Error: Could not load the image {image_path}.")
+            continue
+
+        start = time.perf_counter()
+        exhaustive_val, exhaustive_loc = _matchExhaustive(screen_gray, template)
+        exhaustive_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pyramid_val, pyramid_loc = _matchPyramid(screen_gray, template, pyramid_levels)
+        pyramid_time = time.perf_counter() - start
+
+        exhaustive_found = exhaustive_val >= confidence
+        pyramid_found = pyramid_val >= confidence
+        same_location = abs(exhaustive_loc[0] - pyramid_loc[0]) <= 1 and abs(exhaustive_loc[1] - pyramid_loc[1]) <= 1
+        report.append({
+            "image_path": image_path,
+            "exhaustive_score": exhaustive_val,
+            "exhaustive_location": exhaustive_loc,
+            "exhaustive_time": exhaustive_time,
+            "pyramid_score": pyramid_val,
+            "pyramid_location": pyramid_loc,
+            "pyramid_time": pyramid_time,
+            "agrees": exhaustive_found == pyramid_found and (not exhaustive_found or same_location),
+        })
+
+    if report:
+        agreed = sum(1 for entry in report if entry["agrees"])
+        exhaustive_total = sum(entry["exhaustive_time"] for entry in report)
+        pyramid_total = sum(entry["pyramid_time"] for entry in report)
+        print(f"Pyramid matching agreed on {agreed}/{len(report)} images "
+              f"({exhaustive_total * 1000:.1f} ms exhaustive vs {pyramid_total * 1000:.1f} ms pyramid).")
+    return report
+
+def compareParallelMatching(image_paths):
+    """
+    Check that matching on the worker pool gives exactly the scores of a plain full-frame cv2.matchTemplate.
+
+    Args:
+        image_paths (list): The paths of the images to compare.
+
+    Returns:
+        list: One dict per image with both scores and locations, and whether they are identical.
+    """
+    screen_gray = _grabScreenGray()
+    templates = [(image_path, loadTemplate(image_path)) for image_path in image_paths]
+    templates = [(image_path, template) for image_path, template in templates if template is not None]
+
+    start = time.perf_counter()
+    parallel = _mapMatches(lambda entry: _matchExhaustive(screen_gray, entry[1]), templates)
+    parallel_time = time.perf_counter() - start
+
+    report = []
+    start = time.perf_counter()
+    for (image_path, template), (parallel_val, parallel_loc) in zip(templates, parallel):
+        result = cv2.matchTemplate(screen_gray, template, cv2.TM_CCOEFF_NORMED)
+        min_val, serial_val, min_loc, serial_loc = cv2.minMaxLoc(result)
+        report.append({
+            "image_path": image_path,
+            "serial_score": serial_val,
+            "serial_location": serial_loc,
+            "parallel_score": parallel_val,
+            "parallel_location": parallel_loc,
+            "identical": serial_val == parallel_val and serial_loc == parallel_loc,
+        })
+    serial_time = time.perf_counter() - start
+
+    if report:
+        identical = sum(1 for entry in report if entry["identical"])
+        print(f"Parallel matching was identical on {identical}/{len(report)} images "
+              f"({serial_time * 1000:.1f} ms serial vs {parallel_time * 1000:.1f} ms on {getMatchWorkers()} workers).")
+    return report
+
+def compareAdaptiveWaiting(image_paths, confidence=0.8, timeout=2, pyramid_levels=0, region=None):
+    """
+    Check that waitForImage(adaptive=True) finds every image that plain polling finds, at the same place.
+
+    Run it on a static screen, or with a FileBackend serving the frames of interest.
+
+    Args:
+        image_paths (list): The paths of the images to compare.
+        confidence (float): The confidence threshold for matching. Default is 0.8.
+        timeout (int): How long (in seconds) each wait may take. Default is 2 seconds.
+        pyramid_levels (int): Number of pyramid levels for a coarse-to-fine search. Default is 0 (exhaustive).
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+
+    Returns:
+        list: One dict per image with both locations, the adaptive wait stats, and whether the results agree.
+    """
+    report = []
+    for image_path in image_paths:
+        plain_loc = waitForImage(image_path, confidence=confidence, timeout=timeout, interval=0.1,
+                                 pyramid_levels=pyramid_levels, region=region)
+        adaptive_loc = waitForImage(image_path, confidence=confidence, timeout=timeout, interval=0.1,
+                                    pyramid_levels=pyramid_levels, region=region, adaptive=True)
+        report.append({
+            "image_path": image_path,
+            "plain_location": plain_loc,
+            "adaptive_location": adaptive_loc,
+            "adaptive_stats": getLastWaitStats(),
+            # Adaptive mode may find more (the screen can change between the waits), never less
+            "agrees": plain_loc is None or plain_loc == adaptive_loc,
+        })
+
+    if report:
+        agreed = sum(1 for entry in report if entry["agrees"])
+        print(f"Adaptive waiting found what plain polling found on {agreed}/{len(report)} images.")
+    return report
+
+def _frameChanged(previous, current):
+    """Return True if any pixel changed by more than the noise threshold."""
+    if previous is None or previous.shape != current.shape:
+        return True
+    return int(cv2.absdiff(previous, current).max()) > FRAME_NOISE_THRESHOLD
+
+def getLastWaitStats():
+    """
+    Get the polling counters of the most recent adaptive waitForImage call.
+
+    Returns:
+        dict: The number of frames captured, template matches run and matches skipped on unchanged frames.
+    """
+    return dict(_last_wait_stats)
+
+def waitForImage(image_path, confidence=0.8, timeout=30, interval=1, pyramid_levels=0, region=None, use_last_seen=False,
+                 adaptive=False, min_interval=0.05):
     """
     Wait for an image to appear on the screen.
 
@@ -56,14 +584,25 @@ def waitForImage(image_path, confidence=0.8, timeout=30, interval=1):
         confidence (float): The confidence threshold for matching. Default is 0.8.
         timeout (int): The maximum time (in seconds) to wait for the image. Default is 30 seconds.
         interval (int): The time (in seconds) between each detection attempt. Default is 1 second.
+            In adaptive mode this is the longest delay used while the screen is static.
+        pyramid_levels (int): Number of pyramid levels for a coarse-to-fine search. Default is 0 (exhaustive).
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+        use_last_seen (bool): Search around recent hit locations first. Default is False.
+        adaptive (bool): Skip matching while the screen is unchanged and poll quickly while it changes. Default is False.
+        min_interval (float): The shortest delay (in seconds) between captures in adaptive mode. Default is 0.05 seconds.
 
     Returns:
         tuple: The center (x, y) coordinates of the detected image, or None if not found.
     """
+    if adaptive:
+        return _waitForImageAdaptive(image_path, confidence, timeout, interval, pyramid_levels, region,
+                                     use_last_seen, min_interval)
+
     start_time = time.time()
 
     while time.time() - start_time < timeout:
-        center_coordinates = detectImage(image_path, confidence=confidence)
+        center_coordinates = detectImage(image_path, confidence=confidence, pyramid_levels=pyramid_levels,
+                                         region=region, use_last_seen=use_last_seen)
         if center_coordinates is not None:
             print(f"Image found at: {center_coordinates}")
             return center_coordinates
@@ -73,6 +612,271 @@ def waitForImage(image_path, confidence=0.8, timeout=30, interval=1):
     print("Timed out waiting for the image.")
     return None
 
+def _locateNearRecent(screen_gray, image_path, template, confidence, region):
+    """Match the template only around its recent hit locations inside an already captured frame."""
+    offset_x, offset_y = (region[0], region[1]) if region is not None else (0, 0)
+    frame_height, frame_width = screen_gray.shape
+    bounds = (offset_x, offset_y, frame_width, frame_height)
+
+    for location in _recentLocations(image_path):
+        window = _paddedWindow(location, template.shape, bounds)
+        if window is None:
+            continue
+        x0, y0 = window[0] - offset_x, window[1] - offset_y
+        max_val, max_loc = _matchExhaustive(screen_gray[y0:y0 + window[3], x0:x0 + window[2]], template)
+        if max_val >= confidence:
+            return (window[0] + max_loc[0], window[1] + max_loc[1])
+    return None
+
+def _waitForImageAdaptive(image_path, confidence, timeout, interval, pyramid_levels, region, use_last_seen, min_interval):
+    """Change-aware polling loop behind waitForImage(adaptive=True)."""
+    stats = {"frames": 0, "matches": 0, "skipped": 0}
+    _last_wait_stats.clear()
+    _last_wait_stats.update(stats)
+
+    template = loadTemplate(image_path)
+    if template is None:
+        print("Error: Could not load the image. Please check the image path.")
+        return None
+    template_height, template_width = template.shape
+
+    start_time = time.time()
+    previous_frame = None
+    delay = min_interval
+
+    while time.time() - start_time < timeout:
+        try:
+            screen_gray = _grabScreenGray(region)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return None
+        stats["frames"] += 1
+
+        if _frameChanged(previous_frame, screen_gray):
+            # Compare later frames against the last one that was actually matched, so slow fades still add up
+            previous_frame = screen_gray
+            stats["matches"] += 1
+
+            match_loc = None
+            if use_last_seen:
+                match_loc = _locateNearRecent(screen_gray, image_path, template, confidence, region)
+            if match_loc is None:
+                match_loc = _locateInFrame(screen_gray, template, confidence, pyramid_levels, region)
+
+            if match_loc is not None:
+                if use_last_seen:
+                    _rememberLocation(image_path, match_loc)
+                _last_wait_stats.update(stats)
+                center_coordinates = (match_loc[0] + template_width // 2, match_loc[1] + template_height // 2)
+                print(f"Image found at: {center_coordinates} ({stats['skipped']} unchanged frames skipped)")
+                return center_coordinates
+
+            delay = min_interval  # The screen is changing, so look again soon
+        else:
+            stats["skipped"] += 1
+            delay = min(interval, delay * 2)  # Back off while the screen is static
+
+        _last_wait_stats.update(stats)
+        remaining = timeout - (time.time() - start_time)
+        if remaining > 0:
+            time.sleep(min(delay, remaining))
+
+    print(f"Timed out waiting for the image ({stats['skipped']} unchanged frames skipped).")
+    return None
+
+def waitForAnyImage(image_paths, confidence=0.8, timeout=30, interval=1, pyramid_levels=0, region=None):
+    """
+    Wait for any of several images to appear on the screen.
+
+    Args:
+        image_paths (list): The paths to the images to detect.
+        confidence (float): The confidence threshold for matching. Default is 0.8.
+        timeout (int): The maximum time (in seconds) to wait for an image. Default is 30 seconds.
+        interval (int): The time (in seconds) between each detection attempt. Default is 1 second.
+        pyramid_levels (int): Number of pyramid levels for a coarse-to-fine search. Default is 0 (exhaustive).
+        region (tuple): Only search inside this (x, y, width, height) part of the screen. Default is None.
+
+    Returns:
+        tuple: The (image_path, (x, y)) of the first image found, or None if none appeared. When several images
+            appear on the same frame, the one listed first wins.
+    """
+    start_time = time.time()
+
+    while time.time() - start_time < timeout:
+        results = detectImages(image_paths, confidence=confidence, pyramid_levels=pyramid_levels, region=region)
+        for image_path in image_paths:
+            if results.get(image_path) is not None:
+                print(f"Image {image_path} found at: {results[image_path]}")
+                return (image_path, results[image_path])
+
+        time.sleep(interval)  # Wait before trying again
+
+    print("Timed out waiting for the images.")
+    return None
+
+class ScreenWatcher(threading.Thread):
+    """
+    Background thread that captures the screen at a fixed rate and matches every pending wait on each frame.
+
+    One capture per tick serves all subscriptions, so the capture cost does not grow with the number of waits.
+    The thread idles without capturing while nobody is subscribed.
+    """
+
+    def __init__(self, fps=10, region=None):
+        super().__init__(daemon=True, name="ScreenWatcher")
+        self.interval = 1.0 / fps
+        self.region = region
+        self.latest_frame = None
+        self.latest_frame_time = None
+        self.frame_count = 0
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+
+    def subscribe(self, image_path, confidence=0.8, callback=None, pyramid_levels=0):
+        """
+        Register a template to look for on upcoming frames.
+
+        Args:
+            image_path (str): The path to the image to detect.
+            confidence (float): The confidence threshold for matching. Default is 0.8.
+            callback (callable): Called from the watcher thread with the center (x, y) once the image is found.
+            pyramid_levels (int): Number of pyramid levels for a coarse-to-fine search. Default is 0 (exhaustive).
+
+        Returns:
+            concurrent.futures.Future: Resolves to the center (x, y) coordinates of the image, or None if
+                the template could not be loaded.
+        """
+        future = Future()
+        template = loadTemplate(image_path)
+        if template is None:
+            print("Error: Could not load the image. Please check the image path.")
+            future.set_result(None)
+            return future
+
+        with self._lock:
+            self._subscriptions.append((template, confidence, pyramid_levels, future, callback))
+        self._wake_event.set()
+        return future
+
+    def unsubscribe(self, future):
+        """Stop looking for the template behind the given future and cancel it."""
+        with self._lock:
+            self._subscriptions = [sub for sub in self._subscriptions if sub[3] is not future]
+        future.cancel()
+
+    def getLatestFrame(self):
+        """Return the most recent grayscale frame and the time.time() it was captured at."""
+        with self._lock:
+            return self.latest_frame, self.latest_frame_time
+
+    def stop(self):
+        """Stop the watcher and cancel all pending subscriptions."""
+        self._stop_event.set()
+        self._wake_event.set()
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for sub in subscriptions:
+            sub[3].cancel()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            with self._lock:
+                subscriptions = [sub for sub in self._subscriptions if not sub[3].done()]
+                self._subscriptions = subscriptions
+                if not subscriptions:
+                    self._wake_event.clear()
+            if not subscriptions:
+                self._wake_event.wait()
+                continue
+
+            tick_start = time.time()
+            try:
+                frame = _grabScreenGray(self.region)
+            except Exception as e:
+                print(f"An error occurred while capturing the screen: {e}")
+                self._stop_event.wait(self.interval)
+                continue
+
+            with self._lock:
+                self.latest_frame, self.latest_frame_time = frame, tick_start
+                self.frame_count += 1
+
+            match_locs = _mapMatches(
+                lambda sub: _locateInFrame(frame, sub[0], sub[1], sub[2], self.region), subscriptions
+            )
+            for (template, confidence, pyramid_levels, future, callback), match_loc in zip(subscriptions, match_locs):
+                if match_loc is None:
+                    continue
+                template_height, template_width = template.shape
+                center_coordinates = (match_loc[0] + template_width // 2, match_loc[1] + template_height // 2)
+                if not future.set_running_or_notify_cancel():
+                    continue
+                future.set_result(center_coordinates)
+                if callback is not None:
+                    try:
+                        callback(center_coordinates)
+                    except Exception as e:
+                        print(f"An error occurred in a screen watcher callback: {e}")
+
+            # Keep the capture rate steady regardless of how long matching took
+            self._stop_event.wait(max(0.0, self.interval - (time.time() - tick_start)))
+
+_screen_watcher = None
+_screen_watcher_lock = threading.Lock()
+
+def getScreenWatcher(fps=10):
+    """
+    Get the shared screen watcher, starting it on first use.
+
+    Args:
+        fps (int): The capture rate used when the watcher is started. Default is 10 frames per second.
+
+    Returns:
+        ScreenWatcher: The running shared watcher.
+    """
+    global _screen_watcher
+    with _screen_watcher_lock:
+        if _screen_watcher is None or not _screen_watcher.is_alive():
+            _screen_watcher = ScreenWatcher(fps=fps)
+            _screen_watcher.start()
+        return _screen_watcher
+
+def stopScreenWatcher():
+    """Stop the shared screen watcher if it is running."""
+    global _screen_watcher
+    with _screen_watcher_lock:
+        if _screen_watcher is not None:
+            _screen_watcher.stop()
+            _screen_watcher = None
+
+def watchForImage(image_path, confidence=0.8, timeout=30, callback=None):
+    """
+    Wait for an image to appear, using the shared screen watcher instead of a private capture loop.
+
+    Args:
+        image_path (str): The path to the image to detect.
+        confidence (float): The confidence threshold for matching. Default is 0.8.
+        timeout (int): The maximum time (in seconds) to wait for the image. Default is 30 seconds.
+        callback (callable): Optional function called with the center (x, y) once the image is found.
+
+    Returns:
+        tuple: The center (x, y) coordinates of the detected image, or None if not found.
+    """
+    watcher = getScreenWatcher()
+    future = watcher.subscribe(image_path, confidence=confidence, callback=callback)
+    try:
+        center_coordinates = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        watcher.unsubscribe(future)
+        print("Timed out waiting for the image.")
+        return None
+
+    if center_coordinates is not None:
+        print(f"Image found at: {center_coordinates}")
+    return center_coordinates
+
 def clickOnImage(center_coordinates, click_type="left", double=False, smoothness=0.1, steps=50):
     """
     Click on the specified part of the screen with smooth mouse movement.
@@ -93,6 +897,26 @@ def clickOnImage(center_coordinates, click_type="left", double=False, smoothness
     except Exception as e:
         print(f"An error occurred while clicking: {e}")
 
+def nextCapturePath(folder="captures"):
+    """
+    Return a free file name for a new capture in the given folder, creating the folder if needed.
+
+    Args:
+        folder (str): The capture folder. Default is "captures".
+
+    Returns:
+        str: "captured_region.png", or "captured_region_<n>.png" with the first free number.
+    """
+    os.makedirs(folder, exist_ok=True)
+    output_path = os.path.join(folder, "captured_region.png")
+
+    # If file exists, rename it and increment the number
+    i = 1
+    while os.path.exists(output_path):
+        output_path = os.path.join(folder, f"captured_region_{i}.png")
+        i += 1
+    return output_path
+
 def captureScreenRegion(region, output_path):
     """
     Capture a specific region of the screen and save it as a PNG file.
@@ -106,9 +930,10 @@ def captureScreenRegion(region, output_path):
     """
     try:
         # Capture the specified region
-        screenshot = pyautogui.screenshot(region=region)
+        frame = getCaptureBackend().grab(region)
         # Save the captured region as a PNG file
-        screenshot.save(output_path)
+        if not cv2.imwrite(output_path, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)):
+            raise IOError(f"Could not write {output_path}")
         print(f"Region captured and saved to {output_path}")
         return True
     except Exception as e: